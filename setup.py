@@ -8,6 +8,8 @@ setup(
         "numpy",
         "pandas",
         "matplotlib",
+        "pyarrow",
+        "openpyxl",
     ],
     author="Katie Buchhorn",
     description="Python package for parsing and formulating the Womens Safety Index",
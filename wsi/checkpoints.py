@@ -0,0 +1,40 @@
+# wsi/checkpoints.py
+"""Typed Parquet checkpoints of pipeline stage outputs, keyed by a fingerprint."""
+
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from wsi.utils import cache_data_path, write_atomic
+
+
+def fingerprint(*parts) -> str:
+    """Stable hash of upstream fingerprints and JSON-serialisable config."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def checkpoint_path(stage: str, key: str) -> Path:
+    return cache_data_path("stages", f"{stage}-{key}.parquet")
+
+
+def save_checkpoint(df: pd.DataFrame, stage: str, key: str) -> None:
+    """Store a stage output, dropping checkpoints of that stage for older keys."""
+    path = checkpoint_path(stage, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(path, lambda tmp: df.to_parquet(tmp, index=False))
+    for stale in path.parent.glob(f"{stage}-*.parquet"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def load_checkpoint(stage: str, key: str) -> pd.DataFrame | None:
+    """The stage output stored under `key`, or None if there is none."""
+    path = checkpoint_path(stage, key)
+    if not path.exists():
+        return None
+    return pd.read_parquet(path)
@@ -98,3 +98,84 @@ RENAME_INDICATOR_SCORE = {
     "Cell Phone Use": "Cell Phone Use",
     "Financial Inclusion": "Financial Inclusion",
 }
+
+# Hand-coded substitutions for known data gaps, applied in order after the
+# group-average fill. Target subregions take, for `indicator`, either the
+# per-year mean of the donor subregions ("donors") or the value of a single
+# donor country ("donor_iso", its first-year value for every year), and are
+# tagged with `source`.
+OVERRIDE_RULES = [
+    {
+        "indicator": "Attitudes Towards Violence",
+        "targets": ["Melanesia", "Micronesia", "Polynesia"],
+        "donor_iso": "TLS",
+        "source": "AVG_TLS",
+    },
+    {
+        "indicator": "Attitudes Towards Violence",
+        "targets": ["Central Africa"],
+        "donors": ["Southern Africa", "Northern Africa", "Western Africa"],
+        "source": "AVG_AFR",
+    },
+    {
+        "indicator": "Child Marriage",
+        "targets": ["Australia and New Zealand", "North America"],
+        "donors": ["Northern Europe", "Western Europe"],
+        "source": "AVG_EUR",
+    },
+]
+
+# How dimension scores combine into the WSI: "geometric", "arithmetic",
+# "harmonic", or a number p for the power mean (mean(x**p))**(1/p)
+AGGREGATION = "geometric"
+
+# Monte Carlo imputation uncertainty: standard deviation of the noise added to
+# a cell, as a fraction of its indicator's cross-panel standard deviation,
+# by source tag (observed values are not perturbed)
+IMPUTATION_NOISE = {
+    "ORI": 0.0,
+    "TSI": 0.05,
+    "MDL_POV": 0.1,
+    "AVG_REG": 0.2,
+    "AVG_INC": 0.2,
+    "AVG_TLS": 0.3,
+    "AVG_AFR": 0.3,
+    "AVG_EUR": 0.3,
+}
+
+# Processed outputs: CSVs are always written; optionally also typed Parquet
+# (categorical ISO/region/source columns, float32 values, one partition per
+# Year for the large panels)
+OUTPUT_FORMATS = {
+    "parquet": True,
+    "float32": False,
+    "partition_by_year": False,
+}
+
+# Provenance tags of indicator values. Source columns hold the uint8 position
+# of the tag in this list and are only turned back into strings on export;
+# new tags must be appended so existing codes keep their meaning.
+SOURCE_TAGS = [
+    "",  # no value
+    "ORI",  # original data
+    "TSI",  # time-series interpolation / edge extension
+    "AVG_REG",  # subregion average
+    "AVG_INC",  # income group average
+    "MDL_POV",  # modelled from national poverty data
+    "AVG_TLS",  # Timor-Leste value
+    "AVG_AFR",  # average of other African subregions
+    "AVG_EUR",  # average of Northern/Western Europe
+]
+
+# Composite indicators: weighted average of WDI series read from one file.
+# Within a country, a series missing in a year is filled forward/backward
+# from its other years (years with none of the series are not in the panel).
+COMPOSITE_INDICATORS = {
+    "Access Water Sanitation": {
+        "file": "WorldBank_WorldDevelopmentIndicators_WaterSanitation.csv",
+        "weights": {
+            "SH.STA.BASS.ZS": 0.67,  # basic sanitation services
+            "SH.H2O.BASW.ZS": 0.33,  # basic drinking water
+        },
+    },
+}
@@ -1,6 +1,8 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
-from scipy.stats import gmean
 
 from wsi.indicators.education import build_education_df
 from wsi.indicators.employment import build_employment_df
@@ -16,11 +18,87 @@ from wsi.indicators.electricity import build_access_electricity_df
 from wsi.indicators.financial_inclusion import build_financial_inclusion_df
 from wsi.indicators.phone_use import build_cell_phone_use_df
 
-from wsi.config import INDICATORS, EXCLUDE_ISO, RENAME_INDICATOR_SCORE
+from wsi.checkpoints import fingerprint, load_checkpoint, save_checkpoint
+from wsi.config import (
+    AGGREGATION,
+    INDICATORS,
+    EXCLUDE_ISO,
+    OVERRIDE_RULES,
+    RENAME_INDICATOR_SCORE,
+)
+from wsi.manifest import cached_builds, raw_digests
 from wsi.mapping.iso_name import ISO_NAME
 from wsi.mapping.iso_income import CODE_INCOME
 from wsi.mapping.iso_region import CODE_SUBREGION, SUBREGION_REGION
-from wsi.utils import processed_data_path
+from wsi.outputs import write_output
+from wsi.panel import (
+    SOURCE_CODES,
+    align_panel,
+    apply_overrides,
+    decode_sources,
+    fill_time_series,
+    impute_group_averages,
+)
+from wsi.scoring import power_mean
+from wsi.uncertainty import imputation_uncertainty
+from wsi.utils import file_digest, processed_data_path
+
+
+INDICATOR_BUILDERS = {
+    "Education": build_education_df,
+    "Employment": build_employment_df,
+    "Parliamentary Representation": build_parliamentary_df,
+    "Poverty": build_poverty_df,
+    "Legal Protection Index": build_legal_df,
+    "Son Bias": build_son_bias_df,
+    "Maternal Mortality": build_maternal_mortality_df,
+    "Attitudes Towards Violence": build_attitudes_violence_df,
+    "Child Marriage": build_child_marriage_df,
+    "Access Water Sanitation": build_water_sanitation_df,
+    "Access Electricity": build_access_electricity_df,
+    "Financial Inclusion": build_financial_inclusion_df,
+    "Cell Phone Use": build_cell_phone_use_df,
+}
+
+STAGES = ["ingest", "fill", "score", "export"]
+
+YEARS = list(range(1995, 2025))
+
+
+def build_indicators(
+    max_workers: int | None = 1, incremental: bool = True
+) -> dict[str, pd.DataFrame]:
+    """
+    Run every indicator builder and return their (ISO_code, Year, value) frames.
+
+    Builders are independent, so with max_workers != 1 they run concurrently in
+    a process pool (None uses every core). When incremental, only builders
+    whose raw files, config or code changed since the last run are re-run
+    (see wsi.manifest).
+    """
+    builders = {ind: INDICATOR_BUILDERS[ind] for ind in INDICATORS}
+
+    def run(builders):
+        if max_workers == 1:
+            return {ind: builder() for ind, builder in builders.items()}
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {ind: pool.submit(builder) for ind, builder in builders.items()}
+            return {ind: future.result() for ind, future in futures.items()}
+
+    if not incremental:
+        return run(builders)
+    return cached_builds(builders, run)
+
+
+def assemble_panel(
+    indicator_dfs: dict[str, pd.DataFrame], years: list[int]
+) -> pd.DataFrame:
+    """
+    Align every indicator frame onto the full ISO x year grid in one pass.
+    """
+    frames = {ind: indicator_dfs[ind] for ind in INDICATORS}
+    return align_panel(frames, list(ISO_NAME), years)
 
 
 def normalize_column(column: pd.Series) -> pd.Series:
@@ -31,7 +109,9 @@ def normalize_column(column: pd.Series) -> pd.Series:
     )
 
 
-def apply_indicator_scoring(df: pd.DataFrame) -> pd.DataFrame:
+def apply_indicator_scoring(
+    df: pd.DataFrame, method: str | float = AGGREGATION
+) -> pd.DataFrame:
     dimension_groups = {}
     for indicator, cfg in INDICATORS.items():
         dimension = cfg["dimension"]
@@ -48,66 +128,18 @@ def apply_indicator_scoring(df: pd.DataFrame) -> pd.DataFrame:
         df[dimension] = df[score_cols].mean(axis=1) * 100.0
 
     score_columns = ["Equity", "Protection", "Resources"]
-    df["WSI (Baseline)"] = df[score_columns].apply(
-        lambda row: gmean(row.dropna()) if not row.isnull().all() else pd.NA, axis=1
+    df["WSI (Baseline)"] = power_mean(
+        df[score_columns].to_numpy(dtype=float), method, axis=1
     )
 
     return df
 
 
-def main():
-    """
-    For each indicator:
-    1. Create a full DataFrame of all ISO codes and years.
-    2. Merge the indicator data into this full structure and sort by ISO and Year.
-    3. Fill missing values per country using:
-       - Linear interpolation
-       - Forward and backward fill
-       - Track all filled values with a corresponding source column.
-    4. Compute region and income group averages from the filled data.
-    5. For countries with entirely missing data for an indicator:
-       - Fill using the appropriate average (region or income), based on config.
-       - Mark these with the appropriate source tag (e.g., 'AVG_REG' or 'AVG_INC').
-
-    Finally, normalise and combine indicators to get dimension scores.
-    Combine dimensions to obtain baseline WSI.
-    """
-    pd.set_option("future.no_silent_downcasting", True)
-    years = list(range(1995, 2025))
-    indicator_columns = [k for k in INDICATORS]
-
-    indicator_builders = {
-        "Education": build_education_df,
-        "Employment": build_employment_df,
-        "Parliamentary Representation": build_parliamentary_df,
-        "Poverty": build_poverty_df,
-        "Legal Protection Index": build_legal_df,
-        "Son Bias": build_son_bias_df,
-        "Maternal Mortality": build_maternal_mortality_df,
-        "Attitudes Towards Violence": build_attitudes_violence_df,
-        "Child Marriage": build_child_marriage_df,
-        "Access Water Sanitation": build_water_sanitation_df,
-        "Access Electricity": build_access_electricity_df,
-        "Financial Inclusion": build_financial_inclusion_df,
-        "Cell Phone Use": build_cell_phone_use_df,
-    }
-
-    df_raw = pd.DataFrame(
-        [(iso, year) for iso in ISO_NAME for year in years],
-        columns=["ISO_code", "Year"],
-    )
-
-    for ind in indicator_columns:
-        indicator_df = indicator_builders[ind]()
-        df_raw = df_raw.merge(indicator_df, on=["ISO_code", "Year"], how="left")
-
-    df_raw.to_csv(processed_data_path("raw_baseline_indicators.csv"), index=False)
-
+def missing_indicators_summary(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """Countries with indicators that have no data in any year."""
     missing_summary = []
     for iso, group in df_raw.groupby("ISO_code"):
-        missing_indicators = [
-            col for col in indicator_columns if group[col].isna().all()
-        ]
+        missing_indicators = [col for col in INDICATORS if group[col].isna().all()]
         if missing_indicators:
             missing_summary.append(
                 {
@@ -119,24 +151,81 @@ def main():
             )
 
     summary = pd.DataFrame(missing_summary)
-    summary = summary.sort_values(by="Missing_Count", ascending=False).reset_index(
+    return summary.sort_values(by="Missing_Count", ascending=False).reset_index(
         drop=True
     )
-    summary.to_csv(processed_data_path("missing_indicators_summary.csv"), index=False)
+
+
+def stage_fingerprints() -> dict[str, str]:
+    """
+    Fingerprint of each checkpointed stage: the upstream stage's fingerprint
+    plus the config that stage reads, so a config change invalidates only
+    the stages from the first one that uses it. The ingest fingerprint covers
+    the builder set, years and raw files.
+    """
+    keys = {"ingest": fingerprint(YEARS, list(INDICATORS), raw_digests())}
+    keys["fill"] = fingerprint(
+        keys["ingest"],
+        sorted(EXCLUDE_ISO),
+        {ind: cfg["fill"] for ind, cfg in INDICATORS.items()},
+        OVERRIDE_RULES,
+        CODE_SUBREGION,
+        SUBREGION_REGION,
+        CODE_INCOME,
+        file_digest(processed_data_path("intl_poverty_predictions.csv")),
+    )
+    keys["score"] = fingerprint(
+        keys["fill"],
+        {ind: [cfg["dimension"], cfg["invert"]] for ind, cfg in INDICATORS.items()},
+        AGGREGATION,
+    )
+    return keys
+
+
+def run_ingest(max_workers: int | None = 1, incremental: bool = True) -> pd.DataFrame:
+    """
+    Build every indicator and align them on the full ISO x year grid.
+    """
+    indicator_dfs = build_indicators(max_workers, incremental)
+    df_raw = assemble_panel(indicator_dfs, YEARS)
+
+    write_output(df_raw, "raw_baseline_indicators")
+    write_output(missing_indicators_summary(df_raw), "missing_indicators_summary")
+    return df_raw
+
+
+def run_fill(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fill the included countries:
+    1. Merge in the modelled poverty estimates where there are none.
+    2. Fill missing values per country using:
+       - Linear interpolation
+       - Forward and backward fill
+       - Track all filled values with a corresponding source column.
+    3. Compute region and income group averages from the filled data.
+    4. For countries with entirely missing data for an indicator:
+       - Fill using the appropriate average (region or income), based on config.
+       - Mark these with the appropriate source tag (e.g., 'AVG_REG' or 'AVG_INC').
+    5. Apply the data missingness overrides.
+
+    Excluded countries are appended unfilled, with included_index False.
+    """
+    indicator_columns = [k for k in INDICATORS]
 
     df = df_raw[~df_raw["ISO_code"].isin(EXCLUDE_ISO)].copy()
     df_excluded = df_raw[df_raw["ISO_code"].isin(EXCLUDE_ISO)].copy()
 
     for ind in indicator_columns:
-        df[f"{ind} (source)"] = ""
-        df.loc[df[ind].notna(), f"{ind} (source)"] = "ORI"
+        df[f"{ind} (source)"] = np.where(
+            df[ind].notna(), SOURCE_CODES["ORI"], SOURCE_CODES[""]
+        ).astype(np.uint8)
 
     # For poverty, when we don't have intl poverty line estimates at all, first check the national poverty data
     # (which has been transformed accordingly)
     poverty_estimates = pd.read_csv(
         processed_data_path("intl_poverty_predictions.csv"), index_col=0
     )
-    poverty_estimates["Poverty (source)"] = "MDL_POV"
+    poverty_estimates["Poverty (source)"] = SOURCE_CODES["MDL_POV"]
     df = df.merge(
         poverty_estimates,
         on=["ISO_code", "Year"],
@@ -146,29 +235,16 @@ def main():
 
     # Fill missing 'Poverty' values in df with predicted ones
     df["Poverty"] = df["Poverty"].fillna(df["Poverty_predicted"])
-    df["Poverty (source)"] = (
-        df["Poverty (source)"]
-        .replace("", np.nan)
-        .fillna(df["Poverty (source)_predicted"])
-        .astype(str)
-    )
+    predicted = df["Poverty (source)_predicted"]
+    df["Poverty (source)"] = np.where(
+        (df["Poverty (source)"] == SOURCE_CODES[""]) & predicted.notna(),
+        SOURCE_CODES["MDL_POV"],
+        df["Poverty (source)"],
+    ).astype(np.uint8)
     df = df.drop(columns=["Poverty_predicted", "Poverty (source)_predicted"])
 
-    def fill_missing(group):
-        for ind in indicator_columns:
-            group[ind] = pd.to_numeric(group[ind], errors="coerce")
-            before = group[ind].isnull()
-            group[ind] = group[ind].interpolate(limit_direction="both")
-            after_interp = before & group[ind].notnull()
-            group.loc[after_interp, f"{ind} (source)"] = "TSI"
-            group[ind] = group[ind].ffill().bfill()
-            after_fill = before & group[ind].notnull()
-            group.loc[after_fill, f"{ind} (source)"] = "TSI"
-        return group
-
-    df = df.groupby("ISO_code").apply(fill_missing, include_groups=False)
-    df.index = df.index.droplevel(1)
-    df = df.reset_index(drop=False)
+    df = df.sort_values("ISO_code", kind="stable").reset_index(drop=True)
+    df = fill_time_series(df, indicator_columns)
     df["Subregion"] = df["ISO_code"].map(CODE_SUBREGION)
     df["Region"] = df["Subregion"].map(SUBREGION_REGION)
     df["Income"] = df["ISO_code"].map(CODE_INCOME)
@@ -176,87 +252,146 @@ def main():
     region_avgs = df.groupby(["Subregion", "Year"])[indicator_columns].mean()
     income_avgs = df.groupby(["Income", "Year"])[indicator_columns].mean()
 
-    region_avgs.to_csv(processed_data_path("region_avgs.csv"), index=True)
-    income_avgs.to_csv(processed_data_path("income_avgs.csv"), index=True)
+    write_output(region_avgs, "region_avgs", index=True)
+    write_output(income_avgs, "income_avgs", index=True)
 
-    for ind in indicator_columns:
-        missing = df.groupby("ISO_code")[ind].apply(lambda x: x.isna().all())
-        fill_strategy = INDICATORS[ind]["fill"]
-        for iso in missing[missing].index:
-            if fill_strategy == "income_avg":
-                group = CODE_INCOME.get(iso)
-                if group and (group, years[0]) in income_avgs.index:
-                    fill_vals = income_avgs.loc[group]
-                    df.loc[df["ISO_code"] == iso, ind] = fill_vals[ind].values
-                    df.loc[df["ISO_code"] == iso, f"{ind} (source)"] = "AVG_INC"
-            elif fill_strategy == "region_avg":
-                group = CODE_SUBREGION.get(iso)
-                if group and (group, years[0]) in region_avgs.index:
-                    fill_vals = region_avgs.loc[group]
-                    df.loc[df["ISO_code"] == iso, ind] = fill_vals[ind].values
-                    df.loc[df["ISO_code"] == iso, f"{ind} (source)"] = "AVG_REG"
-
-    # data missingness overwrite (Attitudes Towards Violence -> Timor-Leste)
-    regions_to_fill = ["Melanesia", "Micronesia", "Polynesia"]
-    region_rows = df[df["Subregion"].isin(regions_to_fill)]
-    tls_data = df[df["ISO_code"] == "TLS"]
-    for region in region_rows["ISO_code"].values:
-        df.loc[df["ISO_code"] == region, "Attitudes Towards Violence"] = tls_data[
-            "Attitudes Towards Violence"
-        ].values[0]
-    df.loc[
-        df["Subregion"].isin(regions_to_fill), "Attitudes Towards Violence (source)"
-    ] = "AVG_TLS"
-
-    # Central/Middle African regions (Attitudes Towards Violence)
-    regions_to_fill = ["Central Africa"]
-    substitute_regions = ["Southern Africa", "Northern Africa", "Western Africa"]
-    avg_by_year = (
-        df[df["Subregion"].isin(substitute_regions)]
-        .groupby("Year")["Attitudes Towards Violence"]
-        .mean()
+    df = impute_group_averages(
+        df,
+        {ind: INDICATORS[ind]["fill"] for ind in indicator_columns},
+        {
+            "income_avg": ("Income", income_avgs, "AVG_INC"),
+            "region_avg": ("Subregion", region_avgs, "AVG_REG"),
+        },
     )
-    for year, avg_value in avg_by_year.items():
-        mask = (df["Subregion"].isin(regions_to_fill)) & (df["Year"] == year)
-        df.loc[mask, "Attitudes Towards Violence"] = avg_value
-        df.loc[mask, "Attitudes Towards Violence (source)"] = "AVG_AFR"
-
-    # Aus regions (Child Marriage)
-    regions_to_fill = ["Australia and New Zealand", "North America"]
-    substitute_regions = ["Northern Europe", "Western Europe"]
-    avg_by_year = (
-        df[df["Subregion"].isin(substitute_regions)]
-        .groupby("Year")["Child Marriage"]
-        .mean()
-    )
-    for year, avg_value in avg_by_year.items():
-        mask = (df["Subregion"].isin(regions_to_fill)) & (df["Year"] == year)
-        df.loc[mask, "Child Marriage"] = avg_value
-        df.loc[mask, "Child Marriage (source)"] = "AVG_EUR"
+
+    # data missingness overwrites (e.g. Pacific attitudes from Timor-Leste)
+    df = apply_overrides(df, OVERRIDE_RULES)
+
+    # keep the excluded alongside (no provenance, so sources stay uint8),
+    # and mark which is included
+    for ind in indicator_columns:
+        df_excluded[f"{ind} (source)"] = SOURCE_CODES[""]
+    df["included_index"] = True
+    df_excluded["included_index"] = False
+    return pd.concat([df, df_excluded], ignore_index=True)
+
+
+def run_score(
+    df_filled: pd.DataFrame, draws: int = 0, max_workers: int | None = 1
+) -> pd.DataFrame:
+    """
+    Normalise and combine indicators to get dimension scores, and combine
+    dimensions to obtain baseline WSI for the included countries.
+
+    With draws > 0, also write Monte Carlo percentile bands of the WSI from
+    perturbing the imputed values (see wsi.uncertainty).
+    """
+    included = df_filled["included_index"].to_numpy(dtype=bool)
+    df = df_filled[included].drop(columns="included_index").reset_index(drop=True)
+    df_excluded = df_filled.loc[~included, ["ISO_code", "Year", *INDICATORS]]
+
+    if draws:
+        bands = imputation_uncertainty(df, draws, max_workers)
+        write_output(bands, "womens_safety_index_uncertainty")
 
     # combine to index (get scores and compute baseline index value)
     df_scored = apply_indicator_scoring(df)
 
+    # provenance is held as uint8 codes until now
+    df_scored = decode_sources(df_scored)
+
     # add back the excluded, and mark which is indluded
     df_scored["included_index"] = True
-    df_excluded["included_index"] = False
+    df_excluded = df_excluded.assign(included_index=False)
     df_scored = pd.concat([df_scored, df_excluded], ignore_index=True)
 
-    # store processed result
     df_scored["Economy"] = df_scored["ISO_code"].map(ISO_NAME)
-    
+    return df_scored
+
+
+def run_export(df_scored: pd.DataFrame) -> None:
+    """Rename to the download labels and write the processed result."""
     # for download - rename variables and get index on scale [0,100]
     rename_map = {}
-    for ind in indicator_columns:
+    for ind in INDICATORS:
         score_name = RENAME_INDICATOR_SCORE[ind]
         rename_map[f"{ind} (score)"] = f"{score_name} (score)"
         rename_map[f"{ind} (source)"] = f"{score_name} (source)"
     df_scored = df_scored.rename(columns=rename_map)
-    
-    df_scored.to_csv(
-        processed_data_path("womens_safety_index_baseline.csv"), index=False
-    )
+
+    write_output(df_scored, "womens_safety_index_baseline", partition_by_year=True)
+
+
+def main(
+    max_workers: int | None = 1,
+    draws: int = 0,
+    from_stage: str = "ingest",
+    incremental: bool = True,
+):
+    """
+    Run the stages (ingest -> fill -> score -> export), checkpointing each
+    stage's output under data/cache/stages.
+
+    from_stage resumes from a later stage using the previous stage's
+    checkpoint, e.g. "score" after changing an indicator's invert flag or
+    "export" after relabelling. If that checkpoint is missing or was made
+    under different config, earlier stages are re-run as needed. Ingest
+    re-runs only the builders whose raw files, config or code changed,
+    unless incremental is False.
+    """
+    pd.set_option("future.no_silent_downcasting", True)
+    keys = stage_fingerprints()
+    runners = {
+        "ingest": lambda _: run_ingest(max_workers, incremental),
+        "fill": run_fill,
+        "score": lambda df: run_score(df, draws, max_workers),
+        "export": run_export,
+    }
+
+    start = STAGES.index(from_stage)
+    df = None
+    while start > 0:
+        previous = STAGES[start - 1]
+        df = load_checkpoint(previous, keys[previous])
+        if df is not None:
+            break
+        start -= 1
+
+    for stage in STAGES[start:]:
+        df = runners[stage](df)
+        if stage in keys:
+            save_checkpoint(df, stage, keys[stage])
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Build the baseline WSI.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="indicator builders to run in parallel (0 = all cores)",
+    )
+    parser.add_argument(
+        "--draws",
+        type=int,
+        default=0,
+        help="Monte Carlo draws for imputation uncertainty bands (0 = skip)",
+    )
+    parser.add_argument(
+        "--from-stage",
+        choices=STAGES,
+        default="ingest",
+        help="resume from this stage using the checkpoint of the one before",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="re-run every indicator builder, ignoring cached builder outputs",
+    )
+    args = parser.parse_args()
+    main(
+        max_workers=args.jobs or None,
+        draws=args.draws,
+        from_stage=args.from_stage,
+        incremental=not args.rebuild,
+    )
@@ -1,20 +1,41 @@
 # wsi/indicators/attitudes_violence.py
 
+import numpy as np
 import pandas as pd
-from wsi.utils import raw_data_path
+from wsi.utils import raw_data_path, read_raw_csv
 
 CONFIG = {
     "attitudes_violence": {
         "file": "WVS_Time_Series_1981-2022_csv_v5_0.csv",
+        # only the survey year, wave, country and F199 are used (plus the
+        # design weight when weighted)
+        "usecols": ["S020", "S002VS", "COUNTRY_ALPHA", "F199"],
+        "weight": "S017",
+        # apply the design weight and add a standard error column
+        "weighted": False,
+        "chunksize": 50_000,
     }
 }
 
 
+def usecols(name: str) -> list[str]:
+    """Columns read from the WVS CSV; the weight only when weighting is on."""
+    cfg = CONFIG[name]
+    return cfg["usecols"] + ([cfg["weight"]] if cfg["weighted"] else [])
+
+
 def load_raw(name: str) -> pd.DataFrame:
-    """Load the raw WVS CSV by its CONFIG key."""
+    """Load the raw WVS CSV by its CONFIG key, projected to the used columns."""
+    cfg = CONFIG[name]
+    path = raw_data_path("indicators", cfg["file"])
+    return read_raw_csv(path, usecols=usecols(name))
+
+
+def iter_raw_chunks(name: str):
+    """Stream the projected WVS CSV in fixed-size chunks."""
     cfg = CONFIG[name]
     path = raw_data_path("indicators", cfg["file"])
-    return pd.read_csv(path)
+    return pd.read_csv(path, usecols=usecols(name), chunksize=cfg["chunksize"])
 
 
 def process_attitudes_raw(
@@ -35,7 +56,11 @@ def process_attitudes_raw(
         2 – Female
     """
     df = df.rename(columns={"COUNTRY_ALPHA": "ISO_code"})
-    df = df[["S020", "S002VS", "ISO_code", "F199"]]
+    columns = ["S020", "S002VS", "ISO_code", "F199"]
+    # keep the design weight when present, for the weighted estimates
+    if CONFIG["attitudes_violence"]["weight"] in df.columns:
+        columns.append(CONFIG["attitudes_violence"]["weight"])
+    df = df[columns]
 
     # Optional ISO filter
     if iso_codes is not None:
@@ -43,13 +68,7 @@ def process_attitudes_raw(
 
     # Create the 'year' column based on the minimum year for each survey wave
     # When surveys span multiple years, include all answers in one year on aggregation
-    wave_year = df.groupby(["ISO_code", "S002VS"])["S020"].min().reset_index()
-    wave_map = wave_year.set_index(["ISO_code", "S002VS"])["S020"].to_dict()
-
-    # Assign Year based on wave_map
-    df["Year"] = df.apply(
-        lambda row: wave_map.get((row["ISO_code"], row["S002VS"])), axis=1
-    )
+    df = df.assign(Year=df.groupby(["ISO_code", "S002VS"])["S020"].transform("min"))
 
     # Compute agreement flag
     df["F199agree"] = (df["F199"] > 5).astype(int)
@@ -57,35 +76,136 @@ def process_attitudes_raw(
     return df
 
 
-def build_attitudes_violence_df(iso_codes: list[str] | None = None) -> pd.DataFrame:
+def count_agreement(
+    df: pd.DataFrame, keys: list[str], weight: str | None = None
+) -> pd.DataFrame:
     """
-    Build 'Attitudes Towards Violence' indicator by ISO and Year.
+    Grouped counts of respondents agreeing (F199 > 5) and of valid responses
+    (F199 >= 0) per `keys`.
+
+    With a `weight` column, also the additive sums needed for the weighted
+    proportion and its linearized variance: n (valid, positively weighted
+    respondents), sum(w), sum(w*y), sum(w^2) and sum(w^2*y) over valid
+    responses, where y is the agreement flag.
     """
-    # Load raw data
-    raw = load_raw("attitudes_violence")
+    agree = df["F199"].gt(5)
+    valid = df["F199"].ge(0)
+    flags = {"agree": agree, "valid": valid}
+
+    if weight is not None:
+        w = df[weight].where(valid, 0).fillna(0).clip(lower=0)
+        flags.update(
+            n=w.gt(0),
+            w=w,
+            wy=w * agree,
+            w2=w**2,
+            w2y=w**2 * agree,
+        )
 
-    # Process raw
-    df = process_attitudes_raw(raw, iso_codes)
+    flags = pd.DataFrame(flags, index=df.index)
+    return flags.groupby([df[key] for key in keys]).sum()
 
-    # Aggregate percentage agreement
-    result = (
-        df.groupby(["ISO_code", "Year"])
-        .apply(
-            lambda x: pd.Series(
-                {
-                    "Attitudes Towards Violence": (
-                        (x["F199agree"].sum() / x["F199"].ge(0).sum() * 100)
-                        if x["F199"].ge(0).sum() > 0
-                        else pd.NA
-                    )
-                }
-            ),
-            include_groups=False,
+
+def agreement_share(counts: pd.DataFrame, weighted: bool = False) -> pd.DataFrame:
+    """
+    % agreeing per (ISO_code, Year) from agree/valid counts; waves starting in
+    the same year are pooled and groups without valid responses are dropped.
+
+    weighted=True uses the design-weighted sums from `count_agreement` and adds
+    a Taylor-linearized standard error, "Attitudes Towards Violence (se)":
+        p = sum(w*y) / sum(w)
+        var(p) = n / (n - 1) * sum(w^2 * (y - p)^2) / sum(w)^2
+    (y is binary, so sum(w^2 * (y - p)^2) = (1 - 2p) sum(w^2*y) + p^2 sum(w^2)).
+    """
+    sum_cols = [c for c in counts.columns if c != "Year"]
+    counts = counts.groupby(["ISO_code", "Year"])[sum_cols].sum()
+
+    if not weighted:
+        counts = counts[counts["valid"] > 0]
+        result = (
+            (counts["agree"] / counts["valid"] * 100)
+            .rename("Attitudes Towards Violence")
+            .reset_index()
         )
-        .dropna()
-        .reset_index()
-    )
+    else:
+        counts = counts[counts["w"] > 0]
+        p = counts["wy"] / counts["w"]
+        n = counts["n"]
+        ss = (1 - 2 * p) * counts["w2y"] + p**2 * counts["w2"]
+        var = (n / (n - 1)).where(n > 1) * ss / counts["w"] ** 2
+        result = pd.DataFrame(
+            {
+                "Attitudes Towards Violence": p * 100,
+                "Attitudes Towards Violence (se)": np.sqrt(var.clip(lower=0)) * 100,
+            }
+        ).reset_index()
+
+    result["Year"] = result["Year"].astype(int)
+    return result
+
+
+def accumulate_wave_counts(
+    chunks, iso_codes: list[str] | None = None, weight: str | None = None
+) -> pd.DataFrame:
+    """
+    Reduce a stream of raw WVS chunks to one row per (ISO_code, S002VS) wave.
+
+    Keeps a running minimum survey year ('Year') and the additive counts from
+    `count_agreement`, so memory is bounded by the chunk size rather than the
+    file size.
+    """
+    totals = None
+    for chunk in chunks:
+        chunk = chunk.rename(columns={"COUNTRY_ALPHA": "ISO_code"})
+        if iso_codes is not None:
+            chunk = chunk[chunk["ISO_code"].isin(iso_codes)]
+
+        counts = count_agreement(chunk, ["ISO_code", "S002VS"], weight).assign(
+            Year=chunk.groupby(["ISO_code", "S002VS"])["S020"].min()
+        )
+        if totals is not None:
+            counts = pd.concat([totals, counts])
+        how = {col: "sum" for col in counts.columns}
+        how["Year"] = "min"
+        totals = counts.groupby(level=["ISO_code", "S002VS"]).agg(how)
+
+    return totals
+
+
+def build_attitudes_violence_df(
+    iso_codes: list[str] | None = None, stream: bool = True
+) -> pd.DataFrame:
+    """
+    Build 'Attitudes Towards Violence' indicator by ISO and Year.
+
+    By default the WVS file is streamed in CONFIG["chunksize"] rows and
+    aggregated incrementally; stream=False loads the whole table instead.
+    With CONFIG["weighted"] the WVS design weight is applied and a standard
+    error column is added. The pipeline panel keeps only the indicator
+    column, so the standard error is for callers of this builder.
+    """
+    cfg = CONFIG["attitudes_violence"]
+    weighted = cfg["weighted"]
+    weight = cfg["weight"] if weighted else None
+
+    if not stream:
+        # Load raw
+        raw = load_raw("attitudes_violence")
+
+        # Process raw
+        df = process_attitudes_raw(raw, iso_codes)
+        counts = count_agreement(df, ["ISO_code", "Year"], weight)
+    else:
+        counts = accumulate_wave_counts(
+            iter_raw_chunks("attitudes_violence"), iso_codes, weight
+        )
+
+    # Aggregate percentage agreement
+    result = agreement_share(counts, weighted)
 
-    attitudes_violence_df = result[["ISO_code", "Year", "Attitudes Towards Violence"]]
+    columns = ["ISO_code", "Year", "Attitudes Towards Violence"]
+    if weighted:
+        columns.append("Attitudes Towards Violence (se)")
+    attitudes_violence_df = result[columns]
 
     return attitudes_violence_df
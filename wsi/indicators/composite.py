@@ -0,0 +1,44 @@
+# wsi/indicators/composite.py
+
+import pandas as pd
+from wsi.config import COMPOSITE_INDICATORS
+from wsi.sources.wdi import load_wdi
+
+
+def fill_within_countries(panel: pd.DataFrame, codes: list[str]) -> pd.DataFrame:
+    """
+    Forward then backward fill the `codes` columns within each country.
+    load_wdi only returns years with at least one of the series, so every
+    year of a country is filled from its neighbours, never from nothing.
+    """
+    countries = panel["ISO_code"]
+    filled = panel.groupby(countries)[codes].ffill()
+
+    panel = panel.copy()
+    panel[codes] = filled.groupby(countries).bfill()
+    return panel
+
+
+def weighted_composite(
+    panel: pd.DataFrame, weights: dict[str, float], name: str
+) -> pd.DataFrame:
+    """Weighted average of the `weights` series columns of an ISO_code/Year panel."""
+    codes = list(weights)
+    panel = fill_within_countries(panel, codes)
+
+    total = panel[codes[0]] * weights[codes[0]]
+    for code in codes[1:]:
+        total = total + panel[code] * weights[code]
+    panel[name] = total / sum(weights.values())
+
+    return panel[["ISO_code", "Year", name]]
+
+
+def build_composite_df(name: str, iso_codes: list[str] | None = None) -> pd.DataFrame:
+    """
+    Build a COMPOSITE_INDICATORS indicator by ISO and Year.
+    """
+    cfg = COMPOSITE_INDICATORS[name]
+    series = {code: code for code in cfg["weights"]}
+    panel = load_wdi("indicators", cfg["file"], series, iso_codes)
+    return weighted_composite(panel, cfg["weights"], name)
@@ -2,7 +2,7 @@
 """compute education ratio"""
 
 import pandas as pd
-from wsi.utils import raw_data_path
+from wsi.utils import raw_data_path, read_raw_csv
 
 CONFIG = {
     "female": {
@@ -22,7 +22,7 @@ def load_raw(name: str) -> pd.DataFrame:
     full_path = raw_data_path(
         "indicators", file_name
     )  # e.g. .../WSI/data/raw/NATMON_....csv
-    return pd.read_csv(full_path)
+    return read_raw_csv(full_path)
 
 
 def process_data(
@@ -1,13 +1,22 @@
 # wsi/indicators/employment.py
 
 import pandas as pd
-from wsi.utils import raw_data_path
-from wsi.mapping.country_iso import get_iso
+from wsi.utils import raw_data_path, read_raw_csv
+from wsi.mapping.country_iso import resolve_iso
+from wsi.sources.wdi import load_wdi
+from wsi.weighting import band_population, weighted_band_rate
 
 
 CONFIG = {
     "population": {
         "file": "Population_estimates_projections.csv",
+        # ILO age band: female population series it is made of
+        "bands": {
+            "25-34": ["SP.POP.2529.FE", "SP.POP.3034.FE"],
+            "35-44": ["SP.POP.3539.FE", "SP.POP.4044.FE"],
+            "45-54": ["SP.POP.4549.FE", "SP.POP.5054.FE"],
+            "55-64": ["SP.POP.5559.FE", "SP.POP.6064.FE"],
+        },
     },
     "employment": {
         "file": "EMP_DWAP_SEX_AGE_RT_A-filtered-2025-05-21.csv",
@@ -21,55 +30,21 @@ def load_raw(name: str) -> pd.DataFrame:
     full_path = raw_data_path(
         "indicators", file_name
     )  # e.g. .../WSI/data/raw/NATMON_....csv
-    return pd.read_csv(full_path)
+    return read_raw_csv(full_path)
 
 
-def process_population_data(
-    df: pd.DataFrame, iso_codes: list[str] | None = None
-) -> pd.DataFrame:
-    # Apply ISO filter
-    if iso_codes is not None:
-        df = df[df["Country Code"].isin(iso_codes)]
-
-    # Simplify year columns
-    df.columns = [col.split()[0] if "YR" in col else col for col in df.columns]
-    year_columns = df.columns[4:]
-
-    # Melt to long format
-    df = pd.melt(
-        df,
-        id_vars=["Country Name", "Country Code", "Series Name", "Series Code"],
-        value_vars=year_columns,
-        var_name="Year",
-        value_name="Population",
-    ).rename(columns={"Country Code": "ISO_code"})
-    df["Population"] = pd.to_numeric(df["Population"], errors="coerce")
-    df["Year"] = df["Year"].astype(int)
-
-    # Map and filter age groups
-    age_group_mapping = {
-        "SP.POP.2529.FE": "25-34",
-        "SP.POP.3034.FE": "25-34",
-        "SP.POP.3539.FE": "35-44",
-        "SP.POP.4044.FE": "35-44",
-        "SP.POP.4549.FE": "45-54",
-        "SP.POP.5054.FE": "45-54",
-        "SP.POP.5559.FE": "55-64",
-        "SP.POP.6064.FE": "55-64",
-    }
-    df["Age Group"] = df["Series Code"].map(age_group_mapping)
-    df = df[df["Age Group"].notna()]
-
-    # Aggregate
-    return df.groupby(["ISO_code", "Year", "Age Group"], as_index=False)[
-        "Population"
-    ].sum()
+def load_population(iso_codes: list[str] | None = None) -> pd.DataFrame:
+    """Female population per ILO age band, one column per band."""
+    cfg = CONFIG["population"]
+    series = {code: code for codes in cfg["bands"].values() for code in codes}
+    population = load_wdi("indicators", cfg["file"], series, iso_codes)
+    return band_population(population, cfg["bands"])
 
 
 def process_employment_data(
     df: pd.DataFrame, iso_codes: list[str] | None = None
 ) -> pd.DataFrame:
-    df["ISO_code"] = df["ref_area.label"].apply(lambda name: get_iso(name))
+    df["ISO_code"] = resolve_iso(df["ref_area.label"])
 
     if iso_codes is not None:
         df = df[df["ISO_code"].isin(iso_codes)]
@@ -83,23 +58,17 @@ def process_employment_data(
 def calculate_employment_metric(
     em_df: pd.DataFrame, pop_df: pd.DataFrame
 ) -> pd.DataFrame:
-    merged = em_df.merge(pop_df, on=["ISO_code", "Year", "Age Group"], how="left")
-    merged["Employment"] = merged["Population"] * merged["Employment%"]
-    merged = merged.dropna(subset=["Employment"])
-    agg = merged.groupby(["ISO_code", "Year"], as_index=False).agg(
-        {"Population": "sum", "Employment": "sum"}
-    )
-    agg["Employment"] = agg["Employment"] / agg["Population"]
-    return agg[["ISO_code", "Year", "Employment"]].reset_index(drop=True)
+    """Population-weighted employment rate over the age bands."""
+    agg = weighted_band_rate(em_df, pop_df, "Employment%")
+    return agg.rename(columns={"Employment%": "Employment"})
 
 
 def build_employment_df(iso_codes: list[str] | None = None) -> pd.DataFrame:
     # Load raw
-    pop_raw = load_raw("population")
     emp_raw = load_raw("employment")
 
     # Process
-    pop_df = process_population_data(pop_raw, iso_codes)
+    pop_df = load_population(iso_codes)
     emp_df = process_employment_data(emp_raw, iso_codes)
 
     # Calculate metrics
@@ -1,7 +1,7 @@
 # wsi/indicators/financial_inclusion.py
 
 import pandas as pd
-from wsi.utils import raw_data_path
+from wsi.utils import raw_data_path, read_raw_excel
 
 CONFIG = {
     "financial_inclusion": {
@@ -19,7 +19,7 @@ def load_raw(name: str) -> pd.DataFrame:
     """Load the raw Excel file from the config."""
     cfg = CONFIG[name]
     path = raw_data_path("indicators", cfg["file"])
-    return pd.read_excel(path)
+    return read_raw_excel(path)
 
 
 def process_financial_inclusion_raw(
@@ -1,7 +1,8 @@
 # wsi/indicators/legal_protection.py
 
+import numpy as np
 import pandas as pd
-from wsi.utils import raw_data_path
+from wsi.utils import raw_data_path, read_raw_excel
 
 CONFIG = {
     "legal_protection": {
@@ -15,7 +16,7 @@ def load_raw(name: str) -> pd.DataFrame:
     """Load the specified sheet from the Excel file."""
     cfg = CONFIG[name]
     path = raw_data_path("indicators", cfg["file"])
-    return pd.read_excel(path, sheet_name=cfg["sheet"])
+    return read_raw_excel(path, sheet_name=cfg["sheet"])
 
 
 def process_legal_raw(
@@ -36,71 +37,130 @@ def process_legal_raw(
     return df.reset_index(drop=True)
 
 
-def transform_legal(df: pd.DataFrame) -> pd.DataFrame:
+# Question groups (sections) of the Legal Protection Index
+SELECTED_QUESTIONS = {
+    "MOBILITY": [
+        "Can a woman choose where to live in the same way as a man?",
+        "Can a woman travel outside her home in the same way as a man?",
+        "Can a woman travel outside the country in the same way as a man?",
+    ],
+    "WORKPLACE": [
+        "Can a woman get a job in the same way as a man?",
+        "Does the law prohibit discrimination in employment based on gender?",
+    ],
+    "PAY": [
+        "Does the law mandate equal remuneration for work of equal value?",
+        "Can a woman work at night in the same way as a man?",
+        "Can a woman work in a job deemed dangerous in the same way as a man?",
+        "Can a woman work in an industrial job in the same way as a man?",
+    ],
+    "MARRIAGE": [
+        "Is the law free of legal provisions that require a married woman to obey her husband?",
+        "Can a woman be head of household in the same way as a man?",
+        "Can a woman obtain a judgment of divorce in the same way as a man?",
+        "Does a woman have the same rights to remarry as a man?",
+    ],
+    "PARENTHOOD": [
+        "Is paid leave of at least 14 weeks available to mothers?",
+        "Does the government administer 100 percent of maternity leave benefits?",
+        "Is there paid leave available to fathers?",
+        "Is dismissal of pregnant workers prohibited?",
+    ],
+    "ENTREPRENEURSHIP": [
+        "Does the law prohibit discrimination in access to credit based on gender?"
+    ],
+    "ASSETS": [
+        "Do women and men have equal ownership rights to immovable property?",
+        "Do sons and daughters have equal rights to inherit assets from their parents?",
+        "Do male and female surviving spouses have equal rights to inherit assets?",
+        "Does the law provide for the valuation of nonmonetary contributions?",
+    ],
+    "PENSION": [
+        "Is the age at which women and men can retire with full pension benefits the same?",
+        "Is the age at which women and men can retire with partial pension benefits the same?",
+        "Is the mandatory retirement age for women and men the same?",
+        "Are periods of absence due to childcare accounted for in pension benefits?",
+    ],
+}
+
+# Named index definitions scored by `legal_scores`: each maps sections to
+# questions, with optional relative "section_weights" (default equal).
+QUESTION_SETS = {
+    "Legal Protection Index": {"sections": SELECTED_QUESTIONS},
+}
+
+
+def answer_matrix(df: pd.DataFrame, questions: list[str]) -> np.ndarray:
+    """Boolean (rows x questions) matrix of 'Yes' answers."""
+    answers = df[questions].to_numpy(dtype=str)
+    return np.char.strip(answers) == "Yes"
+
+
+def _section_weights(
+    questions: list[str], sections: dict[str, list[str]]
+) -> np.ndarray:
+    """(questions x sections) matrix averaging each section's questions."""
+    position = {q: i for i, q in enumerate(questions)}
+    weights = np.zeros((len(questions), len(sections)))
+    for j, section_questions in enumerate(sections.values()):
+        for q in section_questions:
+            weights[position[q], j] += 1.0 / len(section_questions)
+    return weights
+
+
+def legal_section_averages(
+    df: pd.DataFrame, sections: dict[str, list[str]] = SELECTED_QUESTIONS
+) -> pd.DataFrame:
+    """Share of 'Yes' answers per section, as '<SECTION>_Average' columns."""
+    questions = list(dict.fromkeys(q for qs in sections.values() for q in qs))
+    averages = answer_matrix(df, questions) @ _section_weights(questions, sections)
+    return pd.DataFrame(
+        averages, columns=[f"{s}_Average" for s in sections], index=df.index
+    )
+
+
+def legal_scores(
+    df: pd.DataFrame, question_sets: dict[str, dict] = QUESTION_SETS
+) -> pd.DataFrame:
     """
-    Convert question responses to binary, compute section averages and overall index.
+    Score every question set in one batch.
+
+    The answers to the union of all questions are converted to a boolean
+    matrix once; each set reduces to a question weight vector (section
+    averages combined by section weight), so all indices come out of a
+    single matrix product. Returns ISO_code, Year and one column per set.
     """
-    # Define question groups
-    selected_questions = {
-        "MOBILITY": [
-            "Can a woman choose where to live in the same way as a man?",
-            "Can a woman travel outside her home in the same way as a man?",
-            "Can a woman travel outside the country in the same way as a man?",
-        ],
-        "WORKPLACE": [
-            "Can a woman get a job in the same way as a man?",
-            "Does the law prohibit discrimination in employment based on gender?",
-        ],
-        "PAY": [
-            "Does the law mandate equal remuneration for work of equal value?",
-            "Can a woman work at night in the same way as a man?",
-            "Can a woman work in a job deemed dangerous in the same way as a man?",
-            "Can a woman work in an industrial job in the same way as a man?",
-        ],
-        "MARRIAGE": [
-            "Is the law free of legal provisions that require a married woman to obey her husband?",
-            "Can a woman be head of household in the same way as a man?",
-            "Can a woman obtain a judgment of divorce in the same way as a man?",
-            "Does a woman have the same rights to remarry as a man?",
-        ],
-        "PARENTHOOD": [
-            "Is paid leave of at least 14 weeks available to mothers?",
-            "Does the government administer 100 percent of maternity leave benefits?",
-            "Is there paid leave available to fathers?",
-            "Is dismissal of pregnant workers prohibited?",
-        ],
-        "ENTREPRENEURSHIP": [
-            "Does the law prohibit discrimination in access to credit based on gender?"
-        ],
-        "ASSETS": [
-            "Do women and men have equal ownership rights to immovable property?",
-            "Do sons and daughters have equal rights to inherit assets from their parents?",
-            "Do male and female surviving spouses have equal rights to inherit assets?",
-            "Does the law provide for the valuation of nonmonetary contributions?",
-        ],
-        "PENSION": [
-            "Is the age at which women and men can retire with full pension benefits the same?",
-            "Is the age at which women and men can retire with partial pension benefits the same?",
-            "Is the mandatory retirement age for women and men the same?",
-            "Are periods of absence due to childcare accounted for in pension benefits?",
-        ],
-    }
+    questions = list(
+        dict.fromkeys(
+            q
+            for qset in question_sets.values()
+            for qs in qset["sections"].values()
+            for q in qs
+        )
+    )
 
-    # Convert Yes/No to 1/0
-    for section, questions in selected_questions.items():
-        df[questions] = df[questions].apply(
-            lambda col: col.map(lambda x: 1 if str(x).strip() == "Yes" else 0)
+    weights = np.zeros((len(questions), len(question_sets)))
+    for k, qset in enumerate(question_sets.values()):
+        sections = qset["sections"]
+        section_weights = np.array(
+            [qset.get("section_weights", {}).get(s, 1.0) for s in sections]
         )
+        section_weights = section_weights / section_weights.sum()
+        weights[:, k] = _section_weights(questions, sections) @ section_weights
 
-    # Compute section averages
-    for section, questions in selected_questions.items():
-        df[f"{section}_Average"] = df[questions].mean(axis=1)
+    scores = answer_matrix(df, questions) @ weights
 
-    # Overall Legal Protection Index
-    section_averages = [f"{sec}_Average" for sec in selected_questions]
-    df["Legal Protection Index"] = df[section_averages].mean(axis=1)
+    result = df[["ISO_code", "Year"]].reset_index(drop=True)
+    for k, name in enumerate(question_sets):
+        result[name] = scores[:, k]
+    return result
 
-    return df[["ISO_code", "Year", "Legal Protection Index"]].reset_index(drop=True)
+
+def transform_legal(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert question responses to binary, compute section averages and overall index.
+    """
+    return legal_scores(df)[["ISO_code", "Year", "Legal Protection Index"]]
 
 
 def build_legal_df(iso_codes: list[str] | None = None) -> pd.DataFrame:
@@ -1,37 +1,32 @@
 # wsi/indicators/maternal_mortality.py
 
 import pandas as pd
-from wsi.utils import raw_data_path, ignore_get_iso
+from wsi.sources.sdg import load_sdg
 
 CONFIG = {"maternal_mortality": {"file": "maternal_mortality.xlsx", "sheet": "Goal3"}}
 
 
-def load_raw(name: str) -> pd.DataFrame:
-    """Load the specified sheet from the Excel file."""
+def load_raw(name: str, iso_codes: list[str] | None = None) -> pd.DataFrame:
+    """Load the ISO-resolved year and value columns of the specified sheet."""
     cfg = CONFIG[name]
-    path = raw_data_path("indicators", cfg["file"])
-    return pd.read_excel(path, sheet_name=cfg.get("sheet"))
+    return load_sdg(
+        "indicators",
+        cfg["file"],
+        ["TimePeriod", "Value"],
+        sheet=cfg.get("sheet"),
+        iso_codes=iso_codes,
+    )
 
 
-def process_maternal_raw(
-    df: pd.DataFrame, iso_codes: list[str] | None = None
-) -> pd.DataFrame:
+def process_maternal_raw(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Map GeoAreaName to ISO, select and rename columns, and optionally filter by iso_codes.
+    Select and rename columns.
     """
-    # Map to ISO, drop aggregates
-    df["ISO_code"] = df["GeoAreaName"].apply(ignore_get_iso)
-    df = df.dropna(subset=["ISO_code"])
-
     # Rename and cast
     df = df.rename(columns={"TimePeriod": "Year", "Value": "Maternal Mortality"})
     df["Year"] = df["Year"].astype(int)
     df["Maternal Mortality"] = pd.to_numeric(df["Maternal Mortality"], errors="coerce")
 
-    # Optional ISO filter
-    if iso_codes is not None:
-        df = df[df["ISO_code"].isin(iso_codes)]
-
     return df[["ISO_code", "Year", "Maternal Mortality"]].reset_index(drop=True)
 
 
@@ -42,9 +37,9 @@ def build_maternal_mortality_df(
     Build maternal mortality DataFrame.
     """
     # Load
-    raw = load_raw("maternal_mortality")
+    raw = load_raw("maternal_mortality", iso_codes)
 
     # Process
-    maternal_mortality_df = process_maternal_raw(raw, iso_codes)
+    maternal_mortality_df = process_maternal_raw(raw)
 
     return maternal_mortality_df
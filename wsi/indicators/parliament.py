@@ -1,38 +1,92 @@
 # wsi/indicators/parliamentary.py
 
+import multiprocessing
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+
+import numpy as np
 import pandas as pd
 
-from wsi.utils import raw_data_path
-from wsi.mapping.country_iso import get_iso
+from wsi.utils import cached_parse, file_digest, raw_data_path, read_raw_excel
+from wsi.mapping.country_iso import resolve_iso
 
+CONFIG = {
+    "parliament": {
+        "file": "women_parliments.xlsx",
+        # workers parsing the yearly sheets (None: one per core). Off by
+        # default: under --jobs this builder already runs in a pool worker,
+        # where a nested pool is never started, so it only helps serial runs
+        "max_workers": 1,
+    }
+}
 
-def build_parliamentary_df(iso_codes: list[str] | None = None) -> pd.DataFrame:
+# Standard column names for every sheet
+COLUMNS = [
+    "Rank",
+    "Country",
+    "Lower Elections",
+    "Lower Seats",
+    "Lower Women",
+    "Lower pWomen",
+    "Upper Elections",
+    "Upper Seats",
+    "Upper Women",
+    "Upper pWomen",
+]
+
+
+def _read_sheet(path, sheet: str, digest: str) -> pd.DataFrame:
+    return read_raw_excel(path, digest, sheet_name=sheet)
+
+
+def _sheet_names(path) -> list[str]:
+    with pd.ExcelFile(path) as xls:
+        return xls.sheet_names
+
+
+def load_raw(name: str) -> dict[str, pd.DataFrame]:
     """
-    Load, clean, and compute % women in parliament (upper + lower) by ISO and Year.
+    Read every yearly sheet of the IPU workbook. Sequentially this is one
+    cached parse of the whole workbook; with CONFIG max_workers != 1
+    (outside a worker process) each sheet is parsed, and cached, by a pool
+    worker. The workbook is hashed once per call.
     """
-    # Read all sheets from the raw Excel file
-    file_path = raw_data_path("indicators", "women_parliments.xlsx")
-    all_sheets = pd.read_excel(file_path, sheet_name=None)
-
-    # Standard column names for every sheet
-    columns = [
-        "Rank",
-        "Country",
-        "Lower Elections",
-        "Lower Seats",
-        "Lower Women",
-        "Lower pWomen",
-        "Upper Elections",
-        "Upper Seats",
-        "Upper Women",
-        "Upper pWomen",
-    ]
+    cfg = CONFIG[name]
+    path = raw_data_path("indicators", cfg["file"])
+    digest = file_digest(path)
+
+    workers = cfg["max_workers"]
+    if workers == 1 or multiprocessing.parent_process() is not None:
+        return read_raw_excel(path, digest, sheet_name=None)
+
+    sheet_names = cached_parse(_sheet_names, "sheet_names", path, digest, version=1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        frames = pool.map(_read_sheet, repeat(path), sheet_names, repeat(digest))
+        return dict(zip(sheet_names, frames))
+
 
+@lru_cache(maxsize=None)
+def clean_country_name(name: str) -> str:
+    """Strip footnote markers, non-ASCII characters and trailing digits."""
+    name = re.sub(r"\*", "", name)
+    name = re.sub(r"[^\x00-\x7F]+", "", name)
+    name = re.sub(r"\(\d+\)", "", name)
+    name = re.sub(r"\d+$", "", name)
+    return name.strip()
+
+
+def process_parliamentary_raw(
+    all_sheets: dict[str, pd.DataFrame], iso_codes: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Stack the yearly sheets and compute % women in parliament (upper + lower).
+    """
     # Process each sheet: drop header row, tag year, unify
     frames = []
     for year_label, df in all_sheets.items():
-        df.columns = columns
+        df.columns = COLUMNS
         df = df.iloc[1:].copy()  # drop the duplicated header row
         df["Year"] = int(year_label)  # safe to cast, sheet names are years
         frames.append(df)
@@ -49,24 +103,27 @@ def build_parliamentary_df(iso_codes: list[str] | None = None) -> pd.DataFrame:
         }
     )
 
-    # Compute combined % women in parliament
-    def pct_women(row):
-        total_seats = row["Lower Seats"] + row["Upper Seats"]
-        total_women = row["Lower Women"] + row["Upper Women"]
-        return (100.0 * total_women / total_seats) if total_seats > 0 else 0.0
-
-    df["Parliamentary Representation"] = df.apply(pct_women, axis=1)
-
-    df["Country"] = (
-        df["Country"]
-        .str.replace(r"\*", "", regex=True)
-        .str.replace(r"[^\x00-\x7F]+", "", regex=True)
-        .str.replace(r"\(\d+\)", "", regex=True)
-        .str.replace(r"\d+$", "", regex=True)
-        .str.strip()
+    # Compute combined % women in parliament (0 where there are no seats)
+    total_seats = (df["Lower Seats"] + df["Upper Seats"]).to_numpy()
+    total_women = (df["Lower Women"] + df["Upper Women"]).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df["Parliamentary Representation"] = np.where(
+            total_seats > 0, 100.0 * total_women / total_seats, 0.0
+        )
+
+    # Clean each distinct country label once
+    codes, uniques = pd.factorize(df["Country"])
+    cleaned = np.array(
+        [
+            clean_country_name(name) if isinstance(name, str) else np.nan
+            for name in uniques
+        ]
+        + [np.nan],
+        dtype=object,
     )
+    df["Country"] = cleaned[codes]
 
-    df["ISO_code"] = df["Country"].apply(lambda name: get_iso(name))
+    df["ISO_code"] = resolve_iso(df["Country"])
 
     # Filter down to requested ISO codes (if provided)
     if iso_codes is not None:
@@ -79,3 +136,11 @@ def build_parliamentary_df(iso_codes: list[str] | None = None) -> pd.DataFrame:
     )
 
     return df
+
+
+def build_parliamentary_df(iso_codes: list[str] | None = None) -> pd.DataFrame:
+    """
+    Load, clean, and compute % women in parliament (upper + lower) by ISO and Year.
+    """
+    all_sheets = load_raw("parliament")
+    return process_parliamentary_raw(all_sheets, iso_codes)
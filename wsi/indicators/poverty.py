@@ -1,46 +1,33 @@
 # wsi/indicators/poverty.py
 
 import pandas as pd
-from wsi.utils import raw_data_path, ignore_get_iso
+from wsi.sources.sdg import load_sdg
 
 
 CONFIG = {
     "poverty": {
         "file": "Goal1.xlsx",
+        # indicator 1.1.1, location ALLAREA, both sexes and all ages
+        "filters": {
+            "Indicator": "1.1.1",
+            "Location": "ALLAREA",
+            "Sex": "BOTHSEX",
+            "Age": "ALLAGE",
+        },
     }
 }
 
 
-def load_raw(name: str) -> pd.DataFrame:
-    """Helper to load the raw Excel by its CONFIG key"""
-    file_name = CONFIG[name]["file"]
-    full_path = raw_data_path("indicators", file_name)
-    return pd.read_excel(full_path)
-
-
-def process_poverty_raw(
-    df: pd.DataFrame, iso_codes: list[str] | None = None
-) -> pd.DataFrame:
-    """
-    Filter to indicator 1.1.1, location ALLAREA, both sexes and all ages,
-    map to ISO codes and optionally filter by iso_codes.
-    """
-    # Filter relevant rows
-    df = df.loc[
-        (df["Indicator"] == "1.1.1")
-        & (df["Location"] == "ALLAREA")
-        & (df["Sex"] == "BOTHSEX")
-        & (df["Age"] == "ALLAGE")
-    ].copy()
-
-    df["ISO_code"] = df["GeoAreaName"].apply(ignore_get_iso)
-    df = df.dropna(subset=["ISO_code"])
-
-    # Optional ISO filter
-    if iso_codes is not None:
-        df = df[df["ISO_code"].isin(iso_codes)]
-
-    return df.reset_index(drop=True)
+def load_raw(name: str, iso_codes: list[str] | None = None) -> pd.DataFrame:
+    """Helper to load the filtered SDG rows by their CONFIG key"""
+    cfg = CONFIG[name]
+    return load_sdg(
+        "indicators",
+        cfg["file"],
+        ["TimePeriod", "Value"],
+        filters=cfg["filters"],
+        iso_codes=iso_codes,
+    )
 
 
 def transform_poverty(df: pd.DataFrame) -> pd.DataFrame:
@@ -57,12 +44,9 @@ def build_poverty_df(
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
     """ """
     # Load raw
-    raw = load_raw("poverty")
-
-    # Process
-    poverty_raw = process_poverty_raw(raw, iso_codes)
+    raw = load_raw("poverty", iso_codes)
 
     # Transform
-    poverty_df = transform_poverty(poverty_raw)
+    poverty_df = transform_poverty(raw)
 
     return poverty_df
@@ -0,0 +1,198 @@
+# wsi/manifest.py
+"""
+Build manifest for incremental rebuilds: the hash of every raw indicator and
+shock file, and the inputs each builder's cached output was made from.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from wsi.checkpoints import fingerprint
+from wsi.config import COMPOSITE_INDICATORS
+from wsi.mapping.country_iso import COUNTRY_ISO
+from wsi.sources.wpp import CONFIG as WPP_CONFIG
+from wsi.utils import (
+    cache_data_path,
+    file_digest,
+    project_root,
+    raw_data_path,
+    write_atomic,
+)
+
+RAW_FOLDERS = ["indicators", "shocks"]
+
+# bump to invalidate every cached builder output
+BUILDER_CACHE_VERSION = 1
+
+# code under wsi/ that builders share besides their own module
+SHARED_CODE = [
+    "utils.py",
+    "weighting.py",
+    "indicators/composite.py",
+    "sources",
+    "mapping",
+]
+
+# builders that read through a shared loader in wsi.sources instead of a
+# file named in their own CONFIG
+SOURCE_INPUTS = {
+    "wsi.indicators.son_bias": [f"indicators/{WPP_CONFIG['file']}"],
+    "wsi.shocks.population": [f"shocks/{WPP_CONFIG['file']}"],
+}
+
+
+def manifest_path():
+    return cache_data_path("builders", "manifest.json")
+
+
+def builder_output_path(name: str):
+    return cache_data_path("builders", f"{name}.parquet")
+
+
+def load_manifest() -> dict:
+    path = manifest_path()
+    if not path.exists():
+        return {"files": {}, "builders": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: dict) -> None:
+    path = manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(tmp):
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+
+    write_atomic(path, write)
+
+
+def raw_digests() -> dict[str, str]:
+    """
+    Content hash of every file under data/raw/{indicators,shocks}, keyed by
+    its path relative to data/raw. Files whose size and mtime match the
+    manifest are not re-read; the refreshed entries are saved back.
+    """
+    manifest = load_manifest()
+    known = manifest["files"]
+    files = {}
+    for folder in RAW_FOLDERS:
+        root = raw_data_path(folder)
+        if not root.is_dir():
+            continue
+        for path in sorted(root.rglob("*")):
+            if not path.is_file():
+                continue
+            key = path.relative_to(raw_data_path()).as_posix()
+            stat = path.stat()
+            entry = known.get(key)
+            if entry and [entry["size"], entry["mtime_ns"]] == [
+                stat.st_size,
+                stat.st_mtime_ns,
+            ]:
+                files[key] = entry
+            else:
+                files[key] = {
+                    "size": stat.st_size,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "digest": file_digest(path),
+                }
+
+    if files != known:
+        manifest["files"] = files
+        save_manifest(manifest)
+    return {key: entry["digest"] for key, entry in files.items()}
+
+
+def builder_inputs(builder: Callable) -> list[str]:
+    """Raw files (relative to data/raw) a builder reads, from its module CONFIG."""
+    module = sys.modules[builder.__module__]
+    folder = module.__name__.split(".")[1] if "." in module.__name__ else ""
+    files = [
+        f"{folder}/{cfg['file']}"
+        for cfg in getattr(module, "CONFIG", {}).values()
+        if isinstance(cfg, dict) and "file" in cfg
+    ]
+    return sorted({*files, *SOURCE_INPUTS.get(module.__name__, [])})
+
+
+def shared_code_digests() -> dict[str, str]:
+    """Content hash of every SHARED_CODE source file, keyed by path under wsi/."""
+    package = project_root() / "wsi"
+    files = []
+    for entry in SHARED_CODE:
+        path = package / entry
+        files.extend(sorted(path.rglob("*.py")) if path.is_dir() else [path])
+    return {path.relative_to(package).as_posix(): file_digest(path) for path in files}
+
+
+def input_key(
+    builder: Callable, digests: dict[str, str], shared: dict[str, str]
+) -> str | None:
+    """
+    Fingerprint of everything a builder's output depends on: its raw files,
+    its module's CONFIG and source, the shared config and mappings it reads
+    (composite weights, country names), the shared code in `shared` and
+    BUILDER_CACHE_VERSION. None if its raw files are unknown.
+    """
+    inputs = builder_inputs(builder)
+    if not inputs:
+        return None
+    module = sys.modules[builder.__module__]
+    source = getattr(module, "__file__", None)
+    return fingerprint(
+        BUILDER_CACHE_VERSION,
+        {path: digests.get(path) for path in inputs},
+        getattr(module, "CONFIG", None),
+        file_digest(Path(source)) if source else None,
+        COMPOSITE_INDICATORS,
+        COUNTRY_ISO,
+        shared,
+    )
+
+
+def cached_builds(
+    builders: dict[str, Callable],
+    run: Callable[[dict[str, Callable]], dict[str, pd.DataFrame]],
+) -> dict[str, pd.DataFrame]:
+    """
+    Outputs of `builders`, calling run() on only those whose inputs (raw
+    files, config or code, see input_key) changed since their cached output
+    (under data/cache/builders) was written. The rest are read back from the
+    cache. Builders with no known inputs always run.
+    """
+    digests = raw_digests()
+    shared = shared_code_digests()
+    manifest = load_manifest()
+    keys = {
+        ind: input_key(builder, digests, shared) for ind, builder in builders.items()
+    }
+
+    stale = {
+        ind: builder
+        for ind, builder in builders.items()
+        if keys[ind] is None
+        or manifest["builders"].get(builder.__name__) != keys[ind]
+        or not builder_output_path(builder.__name__).exists()
+    }
+    outputs = run(stale) if stale else {}
+
+    builder_output_path("").parent.mkdir(parents=True, exist_ok=True)
+    for ind, builder in builders.items():
+        name = builder.__name__
+        if ind not in stale:
+            outputs[ind] = pd.read_parquet(builder_output_path(name))
+        elif keys[ind] is not None:
+            write_atomic(
+                builder_output_path(name),
+                lambda tmp: outputs[ind].to_parquet(tmp, index=False),
+            )
+            manifest["builders"][name] = keys[ind]
+
+    save_manifest(manifest)
+    return {ind: outputs[ind] for ind in builders}
@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
 """Any country text to standard ISO mappings"""
 
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
 # Country name (any variant found in data sources) to ISO code map
 COUNTRY_ISO = {
     "Aruba": "ABW",
@@ -252,11 +258,82 @@ COUNTRY_ISO = {
 }
 
 
+def normalize_name(name: str, ascii_only: bool = False) -> str:
+    """
+    Canonical form of a country name: accents folded, footnote markers
+    ('*', '(1)') and trailing digits removed, whitespace collapsed, casefolded.
+    ascii_only drops non-ASCII characters instead of folding them, matching
+    source files that mangle them (e.g. 'Cte d'Ivoire').
+    """
+    text = str(name)
+    if ascii_only:
+        text = re.sub(r"[^\x00-\x7F]+", "", text)
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = re.sub(r"\(\d+\)|\*", "", text)
+    text = re.sub(r"\d+$", "", text.strip())
+    return " ".join(text.split()).casefold()
+
+
+# normalised name variants to ISO code, built once on import
+NORMALIZED_COUNTRY_ISO = {}
+for _name, _iso in COUNTRY_ISO.items():
+    for _ascii_only in (False, True):
+        NORMALIZED_COUNTRY_ISO.setdefault(normalize_name(_name, _ascii_only), _iso)
+
+
 def get_iso(country_name: str) -> str:
     """
     Return the ISO3 code for a country name, or raises KeyError if not found.
+
+    Exact names are tried first, then their normalised form.
     """
     try:
         return COUNTRY_ISO[country_name]
     except KeyError:
-        raise KeyError(f"Unknown country name: {country_name}")
+        pass
+    for ascii_only in (False, True):
+        iso = NORMALIZED_COUNTRY_ISO.get(normalize_name(country_name, ascii_only))
+        if iso is not None:
+            return iso
+    raise KeyError(f"Unknown country name: {country_name}")
+
+
+def resolve_iso(names: pd.Series, errors: str = "raise") -> pd.Series:
+    """
+    Map a column of country names to ISO3 codes, resolving each distinct
+    name once and broadcasting back through the factorized codes.
+
+    errors="raise" raises KeyError listing every unknown or missing name,
+    as get_iso does; errors="ignore" leaves them as NA (e.g. regional
+    aggregates).
+    """
+    codes, uniques = pd.factorize(names)
+    resolved = np.empty(len(uniques) + 1, dtype=object)
+    resolved[-1] = pd.NA  # code -1: missing name
+
+    missing = []
+    for i, name in enumerate(uniques):
+        try:
+            resolved[i] = get_iso(name)
+        except KeyError:
+            resolved[i] = pd.NA
+            missing.append(name)
+
+    if (codes == -1).any():
+        missing.append(np.nan)
+    if missing and errors == "raise":
+        raise KeyError(f"Unknown country names: {missing}")
+
+    return pd.Series(resolved[codes], index=names.index, name=names.name)
+
+
+def unmatched_names(names: pd.Series) -> list[str]:
+    """Distinct names in `names` that do not resolve to an ISO3 code."""
+    unmatched = []
+    for name in pd.unique(names.dropna()):
+        try:
+            get_iso(name)
+        except KeyError:
+            unmatched.append(name)
+    return unmatched
@@ -0,0 +1,114 @@
+# wsi/outputs.py
+"""Writers and readers for the processed outputs (CSV plus typed Parquet)."""
+
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from wsi.config import OUTPUT_FORMATS
+from wsi.utils import processed_data_path, write_atomic
+
+# low-cardinality text columns stored as categoricals
+CATEGORICAL_COLUMNS = {"ISO_code", "Economy", "Subregion", "Region", "Income"}
+
+
+def typed_frame(df: pd.DataFrame, float32: bool = False) -> pd.DataFrame:
+    """Categorical ISO/region/source columns and, optionally, float32 values."""
+    df = df.copy()
+    for col in df.columns:
+        if col in CATEGORICAL_COLUMNS or str(col).endswith("(source)"):
+            df[col] = df[col].astype("category")
+        elif float32 and df[col].dtype == np.float64:
+            df[col] = df[col].astype(np.float32)
+    return df
+
+
+def write_output(
+    df: pd.DataFrame,
+    name: str,
+    index: bool = False,
+    partition_by_year: bool = False,
+    formats: dict = OUTPUT_FORMATS,
+) -> None:
+    """
+    Write `df` to data/processed/<name>.csv and, if enabled, <name>.parquet
+    (a directory with one partition per Year when partition_by_year is set
+    and enabled in `formats`). Files are swapped in whole, never half-written.
+    A single Parquet file is replaced atomically; a dataset directory is not
+    (see _swap_in), but the CSV is written first, so a read_output falling
+    back to it in between still gets the new rows.
+    """
+    csv_path = processed_data_path(f"{name}.csv")
+    write_atomic(csv_path, lambda path: df.to_csv(path, index=index))
+
+    if not formats["parquet"]:
+        return
+
+    typed = typed_frame(df, formats["float32"])
+    parquet_path = processed_data_path(f"{name}.parquet")
+    if partition_by_year and formats["partition_by_year"]:
+        tmp = parquet_path.with_name(f"{parquet_path.name}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        typed.to_parquet(tmp, index=index, partition_cols=["Year"])
+        _swap_in(tmp, parquet_path)
+    elif parquet_path.is_dir():
+        tmp = parquet_path.with_name(f"{parquet_path.name}.tmp")
+        typed.to_parquet(tmp, index=index, compression="zstd")
+        _swap_in(tmp, parquet_path)
+    else:
+        write_atomic(
+            parquet_path,
+            lambda path: typed.to_parquet(path, index=index, compression="zstd"),
+        )
+
+
+def _swap_in(new: Path, path: Path) -> None:
+    """
+    Replace `path` (a file or directory) by `new`: the old one is renamed
+    aside before the new one is renamed into place, then removed. A rename
+    cannot replace a directory, so between the two renames `path` briefly
+    does not exist; readers never see a partly written dataset, only none.
+    """
+    old = path.with_name(f"{path.name}.old")
+    shutil.rmtree(old, ignore_errors=True)
+    if path.exists():
+        path.rename(old)
+    new.rename(path)
+    if old.is_dir():
+        shutil.rmtree(old)
+    else:
+        old.unlink(missing_ok=True)
+
+
+def read_output(
+    name: str,
+    columns: list[str] | None = None,
+    years: list[int] | None = None,
+) -> pd.DataFrame:
+    """
+    Read a processed output, from Parquet when available (only the requested
+    columns, and Year partitions/row groups, are touched) else from the CSV.
+    Year-partitioned outputs come back grouped by Year.
+    """
+    read_cols = columns
+    if columns is not None and years is not None and "Year" not in columns:
+        read_cols = [*columns, "Year"]
+
+    parquet_path = processed_data_path(f"{name}.parquet")
+    if parquet_path.exists():
+        filters = [("Year", "in", list(years))] if years is not None else None
+        df = pd.read_parquet(parquet_path, columns=read_cols, filters=filters)
+        if "Year" in df.columns and isinstance(df["Year"].dtype, pd.CategoricalDtype):
+            # partition keys come back as categories, and last
+            df["Year"] = df["Year"].astype(int)
+            if columns is None:
+                header = pd.read_csv(processed_data_path(f"{name}.csv"), nrows=0)
+                df = df[[col for col in header.columns if col in df.columns]]
+    else:
+        df = pd.read_csv(processed_data_path(f"{name}.csv"), usecols=read_cols)
+        if years is not None:
+            df = df[df["Year"].isin(years)].reset_index(drop=True)
+
+    return df[columns] if columns is not None else df
@@ -0,0 +1,236 @@
+# wsi/panel.py
+"""Dense (country, year, indicator) array engines for filling the WSI panel."""
+
+import numpy as np
+import pandas as pd
+
+from wsi.config import SOURCE_TAGS
+
+SOURCE_CODES = {tag: np.uint8(code) for code, tag in enumerate(SOURCE_TAGS)}
+
+
+def source_columns(df: pd.DataFrame) -> list[str]:
+    return [col for col in df.columns if str(col).endswith(" (source)")]
+
+
+def encode_sources(df: pd.DataFrame) -> pd.DataFrame:
+    """Replace string provenance tags in the source columns by uint8 codes."""
+    df = df.copy()
+    for col in source_columns(df):
+        tags = df[col].fillna("").astype(str)
+        df[col] = tags.map(SOURCE_CODES).astype(np.uint8)
+    return df
+
+
+def decode_sources(df: pd.DataFrame) -> pd.DataFrame:
+    """Materialise the uint8 source codes as their string tags (for export)."""
+    df = df.copy()
+    tags = np.array(SOURCE_TAGS, dtype=object)
+    for col in source_columns(df):
+        df[col] = tags[df[col].to_numpy(dtype=np.uint8)]
+    return df
+
+
+def imputed_share(df: pd.DataFrame, by: str = "ISO_code") -> pd.DataFrame:
+    """Share of each group's indicator values that are not original data."""
+    cols = source_columns(df)
+    codes = df[cols].to_numpy(dtype=np.uint8)
+    imputed = (codes > SOURCE_CODES["ORI"]).astype(float)
+    return pd.DataFrame(imputed, columns=cols, index=df.index).groupby(df[by]).mean()
+
+
+def align_panel(
+    frames: dict[str, pd.DataFrame], isos: list[str], years: list[int]
+) -> pd.DataFrame:
+    """
+    Long ISO_code x Year panel over the `isos` x `years` grid with one column
+    per frame (its `name` column), filled in a single pass.
+
+    Every frame's rows are placed by an integer (country, year) key into a
+    preallocated block; rows off the grid are dropped. Raises ValueError
+    naming the first frame with a repeated (ISO_code, Year) pair.
+    """
+    iso_index = pd.Index(isos)
+    year_index = pd.Index(years)
+    n_rows = len(isos) * len(years)
+
+    block = np.full((n_rows, len(frames)), np.nan)
+    text = {}
+    for j, (name, df) in enumerate(frames.items()):
+        iso = iso_index.get_indexer(df["ISO_code"])
+        year = year_index.get_indexer(df["Year"])
+        on_grid = (iso >= 0) & (year >= 0)
+        key = iso[on_grid].astype(np.int64) * len(years) + year[on_grid]
+        if len(np.unique(key)) != len(key):
+            raise ValueError(f"duplicate (ISO_code, Year) rows in {name}")
+
+        values = df[name].to_numpy()[on_grid]
+        if pd.api.types.is_numeric_dtype(df[name]):
+            block[key, j] = values
+        else:
+            # e.g. values reported as "<0.1" stay as they are
+            column = np.full(n_rows, np.nan, dtype=object)
+            column[key] = values
+            text[name] = column
+
+    panel = pd.DataFrame(block, columns=list(frames), copy=False)
+    for name, column in text.items():
+        panel[name] = column
+    panel.insert(0, "ISO_code", np.repeat(np.array(isos, dtype=object), len(years)))
+    panel.insert(1, "Year", np.tile(np.array(years), len(isos)))
+    return panel
+
+
+def panel_codes(df: pd.DataFrame) -> tuple[np.ndarray, pd.Index, np.ndarray, pd.Index]:
+    """
+    Integer country and year codes for each row of a long ISO_code/Year frame.
+
+    Years are sorted so the year axis of a dense panel runs forwards in time.
+    Raises ValueError if any (ISO_code, Year) pair occurs more than once.
+    """
+    iso_idx, isos = pd.factorize(df["ISO_code"])
+    year_idx, years = pd.factorize(df["Year"], sort=True)
+    flat = iso_idx.astype(np.int64) * len(years) + year_idx
+    if len(np.unique(flat)) != len(flat):
+        raise ValueError("duplicate (ISO_code, Year) rows in panel")
+    return iso_idx, isos, year_idx, years
+
+
+def to_dense(
+    df: pd.DataFrame, columns: list[str], codes: tuple | None = None
+) -> np.ndarray:
+    """Scatter `columns` of a long frame into a (country, year, column) float array."""
+    iso_idx, isos, year_idx, years = codes or panel_codes(df)
+    dense = np.full((len(isos), len(years), len(columns)), np.nan)
+    dense[iso_idx, year_idx] = (
+        df[columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    )
+    return dense
+
+
+def interpolate_panel(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Linearly interpolate every (country, indicator) series along the year axis
+    and extend the first/last observation to the edges, all at once.
+
+    Matches pandas `interpolate(limit_direction="both")` followed by
+    `ffill().bfill()`: same np.interp formula, constant edges, and series
+    without any observation stay NaN. Returns the filled array and a mask of
+    the cells that were filled.
+    """
+    valid = ~np.isnan(values)
+    n_years = values.shape[1]
+    t = np.arange(n_years).reshape(1, -1, 1)
+
+    # nearest observed year at or before / at or after each cell
+    prev = np.maximum.accumulate(np.where(valid, t, -1), axis=1)
+    after = np.where(valid, t, n_years)[:, ::-1]
+    nxt = np.minimum.accumulate(after, axis=1)[:, ::-1]
+    has_prev = prev >= 0
+    has_next = nxt < n_years
+
+    x_prev = np.take_along_axis(values, np.clip(prev, 0, n_years - 1), axis=1)
+    x_next = np.take_along_axis(values, np.clip(nxt, 0, n_years - 1), axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (x_next - x_prev) / (nxt - prev)
+        between = slope * (t - prev) + x_prev
+
+    filled = np.where(
+        valid,
+        values,
+        np.where(has_prev & has_next, between, np.where(has_prev, x_prev, x_next)),
+    )
+    return filled, ~valid & ~np.isnan(filled)
+
+
+def fill_time_series(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """
+    Fill gaps in each country's `columns` by interpolation and edge extension,
+    tagging every filled cell 'TSI' in the matching '<column> (source)'.
+    """
+    codes = panel_codes(df)
+    iso_idx, _, year_idx, _ = codes
+    filled, new = interpolate_panel(to_dense(df, columns, codes))
+
+    sources = [f"{col} (source)" for col in columns]
+    tags = df[sources].to_numpy(dtype=np.uint8)
+
+    df = df.copy()
+    df[columns] = filled[iso_idx, year_idx]
+    df[sources] = np.where(new[iso_idx, year_idx], SOURCE_CODES["TSI"], tags)
+    return df
+
+
+def impute_group_averages(
+    df: pd.DataFrame,
+    strategies: dict[str, str],
+    averages: dict[str, tuple[str, pd.DataFrame, str]],
+) -> pd.DataFrame:
+    """
+    Fill countries with no data at all for an indicator from a group average.
+
+    `strategies` maps each indicator column to a fill strategy, and
+    `averages` maps each strategy to (group column, averages indexed on
+    (group, Year), source tag), e.g.
+        {"income_avg": ("Income", income_avgs, "AVG_INC")}.
+    The all-missing (country x indicator) mask is computed once, averages are
+    joined onto the rows by (group, Year), and values and source tags are
+    written in a single assignment. Countries whose group has no average are
+    left untouched.
+    """
+    columns = list(strategies)
+    sources = [f"{col} (source)" for col in columns]
+
+    iso_idx, isos = pd.factorize(df["ISO_code"])
+    all_missing = df[columns].isna().groupby(iso_idx).all().to_numpy()[iso_idx]
+
+    values = df[columns].to_numpy(dtype=float)
+    tags = df[sources].to_numpy(dtype=np.uint8)
+
+    for strategy, (group_col, avgs, tag) in averages.items():
+        cols = [k for k, col in enumerate(columns) if strategies[col] == strategy]
+        if not cols:
+            continue
+
+        keys = pd.MultiIndex.from_arrays([df[group_col], df["Year"]])
+        joined = avgs[[columns[k] for k in cols]].reindex(keys).to_numpy(dtype=float)
+        has_group = df[group_col].isin(avgs.index.get_level_values(0)).to_numpy()
+
+        fill = all_missing[:, cols] & has_group[:, None]
+        values[:, cols] = np.where(fill, joined, values[:, cols])
+        tags[:, cols] = np.where(fill, SOURCE_CODES[tag], tags[:, cols])
+
+    df = df.copy()
+    df[columns] = values
+    df[sources] = tags
+    return df
+
+
+def apply_overrides(df: pd.DataFrame, rules: list[dict]) -> pd.DataFrame:
+    """
+    Apply declarative regional substitutions (see config.OVERRIDE_RULES).
+
+    Each rule is resolved with one grouped reduction over its donors and a
+    masked assignment over its target subregions; rules run in order so a
+    later rule sees earlier substitutions.
+    """
+    df = df.copy()
+    subregion = df["Subregion"]
+
+    for rule in rules:
+        ind = rule["indicator"]
+        target = subregion.isin(rule["targets"]).to_numpy()
+
+        if "donor_iso" in rule:
+            donor = df.loc[df["ISO_code"] == rule["donor_iso"], ind]
+            value = np.full(len(df), donor.iloc[0], dtype=float)
+        else:
+            donor_rows = subregion.isin(rule["donors"])
+            by_year = df.loc[donor_rows].groupby("Year")[ind].mean()
+            value = df["Year"].map(by_year).to_numpy(dtype=float)
+            target = target & df["Year"].isin(by_year.index).to_numpy()
+
+        df.loc[target, ind] = value[target]
+        df.loc[target, f"{ind} (source)"] = SOURCE_CODES[rule["source"]]
+
+    return df
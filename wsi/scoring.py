@@ -0,0 +1,83 @@
+# wsi/scoring.py
+"""Array kernels for combining normalised scores into the WSI."""
+
+import numpy as np
+
+POWER_MEAN_EXPONENTS = {"arithmetic": 1.0, "geometric": 0.0, "harmonic": -1.0}
+
+
+def min_max_scale(values: np.ndarray, invert: np.ndarray) -> np.ndarray:
+    """
+    Column-wise min-max scaling of a (rows x indicators) array, NaN-aware,
+    flipped (1 - x) where `invert` is set. Constant columns are left as-is,
+    as in `normalize_column`.
+    """
+    values = np.asarray(values, dtype=float)
+    with np.errstate(invalid="ignore"):
+        low = np.nanmin(values, axis=0)
+        high = np.nanmax(values, axis=0)
+    span = high - low
+    constant = span == 0
+    scaled = np.where(constant, values, (values - low) / np.where(constant, 1, span))
+    return np.where(np.asarray(invert, dtype=bool), 1 - scaled, scaled)
+
+
+def power_mean(
+    values: np.ndarray,
+    method: str | float = "geometric",
+    axis: int = -1,
+    weights: np.ndarray | None = None,
+):
+    """
+    NaN-aware (weighted) power mean of `values` along `axis`.
+
+    `method` is "arithmetic", "geometric", "harmonic" or a power-mean exponent p
+    (p = 0 is the geometric mean, computed as exp(mean(log x))). `weights`
+    must broadcast against `values`; missing values are skipped and the
+    remaining weights renormalised. An all-missing slice gives NaN.
+    """
+    p = POWER_MEAN_EXPONENTS.get(method, method)
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    if weights is not None:
+        # zero-weight entries drop out like missing ones
+        valid = valid & (np.asarray(weights) > 0)
+        weights = np.where(valid, weights, 0.0)
+    count = valid.sum(axis=axis)
+    norm = count if weights is None else weights.sum(axis=axis)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if p == 0:
+            transformed = np.log(values)
+        else:
+            transformed = values**p
+        if weights is not None:
+            transformed = np.where(valid, transformed * weights, 0.0)
+        total = np.where(valid, transformed, 0.0).sum(axis=axis)
+        mean = total / norm
+        result = np.exp(mean) if p == 0 else mean ** (1.0 / p)
+
+    return np.where(count > 0, result, np.nan)
+
+
+def score_values(
+    values: np.ndarray,
+    invert: np.ndarray,
+    membership: np.ndarray,
+    method: str | float = "geometric",
+) -> np.ndarray:
+    """
+    WSI of a (rows x indicators) panel of raw indicator values.
+
+    The array form of `apply_indicator_scoring`: min-max scale (inverting
+    where flagged), NaN-aware mean within each dimension given by the
+    (indicators x dimensions) `membership` matrix, times 100, then combine
+    the dimensions with `power_mean`.
+    """
+    scaled = min_max_scale(values, invert)
+    valid = ~np.isnan(scaled)
+    total = np.where(valid, scaled, 0.0) @ membership
+    count = valid.astype(float) @ membership
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dimensions = np.where(count > 0, total / count * 100.0, np.nan)
+    return power_mean(dimensions, method, axis=1)
@@ -0,0 +1,166 @@
+# wsi/sensitivity.py
+"""Batched evaluation of the WSI under many alternative weightings."""
+
+import numpy as np
+import pandas as pd
+
+from wsi.config import AGGREGATION, INDICATORS
+from wsi.scoring import min_max_scale, power_mean
+
+# indicator and dimension order of every weight matrix in this module
+INDICATOR_ORDER = list(INDICATORS)
+DIMENSION_ORDER = list(dict.fromkeys(cfg["dimension"] for cfg in INDICATORS.values()))
+
+
+def normalized_score_matrix(df: pd.DataFrame) -> np.ndarray:
+    """(rows x indicators) array of the normalised indicator scores of `df`."""
+    invert = [INDICATORS[ind]["invert"] for ind in INDICATOR_ORDER]
+    return min_max_scale(df[INDICATOR_ORDER].to_numpy(dtype=float), invert)
+
+
+def dimension_membership() -> np.ndarray:
+    """(indicators x dimensions) 0/1 matrix of which indicator feeds which dimension."""
+    membership = np.zeros((len(INDICATOR_ORDER), len(DIMENSION_ORDER)))
+    for i, ind in enumerate(INDICATOR_ORDER):
+        membership[i, DIMENSION_ORDER.index(INDICATORS[ind]["dimension"])] = 1.0
+    return membership
+
+
+def dirichlet_weights(k: int, n: int, seed: int | None = None) -> np.ndarray:
+    """k random weight vectors over n components, uniform on the simplex."""
+    return np.random.default_rng(seed).dirichlet(np.ones(n), size=k)
+
+
+def score_weight_scenarios(
+    scores: np.ndarray,
+    indicator_weights: np.ndarray,
+    dimension_weights: np.ndarray | None = None,
+    method: str | float = AGGREGATION,
+    chunk_size: int = 256,
+) -> np.ndarray:
+    """
+    WSI for K weighting scenarios at once.
+
+    `scores` is the (rows x indicators) normalised score array,
+    `indicator_weights` a (K x indicators) matrix of within-dimension weights
+    and `dimension_weights` a (K x dimensions) matrix for the aggregation
+    across dimensions (equal if None). Dimension scores are NaN-aware
+    weighted means (x 100), as in `apply_indicator_scoring` when the weights
+    are equal. Scenarios are evaluated `chunk_size` at a time as tensor
+    contractions; returns a (K x rows) array.
+    """
+    indicator_weights = np.atleast_2d(indicator_weights)
+    k = len(indicator_weights)
+    if dimension_weights is None:
+        dimension_weights = np.ones((k, len(DIMENSION_ORDER)))
+    dimension_weights = np.atleast_2d(dimension_weights)
+
+    valid = ~np.isnan(scores)
+    filled = np.where(valid, scores, 0.0)
+    valid = valid.astype(float)
+    membership = dimension_membership()
+
+    result = np.empty((k, len(scores)))
+    for start in range(0, k, chunk_size):
+        stop = min(start + chunk_size, k)
+        # (indicators, chunk * dimensions) weights, so each contraction is one matmul
+        w = indicator_weights[start:stop, :, None] * membership[None]
+        w = w.transpose(1, 0, 2).reshape(len(membership), -1)
+        shape = (len(scores), stop - start, len(DIMENSION_ORDER))
+        total = (filled @ w).reshape(shape).transpose(1, 0, 2)
+        norm = (valid @ w).reshape(shape).transpose(1, 0, 2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dimensions = np.where(norm > 0, total / norm * 100.0, np.nan)
+        result[start:stop] = power_mean(
+            dimensions, method, axis=2, weights=dimension_weights[start:stop, None]
+        )
+    return result
+
+
+def rank_scenarios(scenario_scores: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """
+    Rank rows within each year for every scenario (1 = highest WSI);
+    rows without a score get NaN.
+    """
+    ranks = np.full(scenario_scores.shape, np.nan)
+    for year in np.unique(years):
+        cols = np.flatnonzero(years == year)
+        block = scenario_scores[:, cols]
+        order = np.argsort(np.where(np.isnan(block), np.inf, -block), axis=1)
+        year_ranks = np.empty(block.shape)
+        np.put_along_axis(
+            year_ranks, order, np.arange(1, len(cols) + 1, dtype=float)[None], axis=1
+        )
+        ranks[:, cols] = np.where(np.isnan(block), np.nan, year_ranks)
+    return ranks
+
+
+def _percentile_columns(
+    scores: np.ndarray, ranks: np.ndarray, percentiles: tuple[float, ...]
+) -> dict[str, np.ndarray]:
+    """Per-row score and rank percentiles across the scenario axis."""
+    columns = {}
+    with np.errstate(invalid="ignore"):
+        for q in percentiles:
+            columns[f"WSI p{q:g}"] = np.nanpercentile(scores, q, axis=0)
+        for q in percentiles:
+            columns[f"Rank p{q:g}"] = np.nanpercentile(ranks, q, axis=0)
+    return columns
+
+
+def weight_sensitivity(
+    df: pd.DataFrame,
+    indicator_weights: np.ndarray,
+    dimension_weights: np.ndarray | None = None,
+    method: str | float = AGGREGATION,
+    percentiles: tuple[float, ...] = (5, 50, 95),
+) -> tuple[np.ndarray, np.ndarray, pd.DataFrame]:
+    """
+    Score the filled panel `df` under K weightings.
+
+    Returns the (K x rows) scenario WSI scores, their within-year ranks and a
+    per-row summary (ISO_code, Year and rank/score percentiles across
+    scenarios). For large K use weight_sensitivity_summary, which never
+    holds the full arrays.
+    """
+    scores = score_weight_scenarios(
+        normalized_score_matrix(df), indicator_weights, dimension_weights, method
+    )
+    ranks = rank_scenarios(scores, df["Year"].to_numpy())
+
+    summary = df[["ISO_code", "Year"]].reset_index(drop=True)
+    for col, values in _percentile_columns(scores, ranks, percentiles).items():
+        summary[col] = values
+    return scores, ranks, summary
+
+
+def weight_sensitivity_summary(
+    df: pd.DataFrame,
+    indicator_weights: np.ndarray,
+    dimension_weights: np.ndarray | None = None,
+    method: str | float = AGGREGATION,
+    percentiles: tuple[float, ...] = (5, 50, 95),
+) -> pd.DataFrame:
+    """
+    The summary of weight_sensitivity alone. Ranks only compare rows of the
+    same year, so the panel is scored one year at a time and each year's
+    (K x rows) scores and ranks are reduced to their percentiles before the
+    next year is scored.
+    """
+    normalized = normalized_score_matrix(df)
+    years = df["Year"].to_numpy()
+
+    summary = df[["ISO_code", "Year"]].reset_index(drop=True)
+    columns = {}
+    for year in np.unique(years):
+        rows = np.flatnonzero(years == year)
+        scores = score_weight_scenarios(
+            normalized[rows], indicator_weights, dimension_weights, method
+        )
+        ranks = rank_scenarios(scores, years[rows])
+        for col, values in _percentile_columns(scores, ranks, percentiles).items():
+            columns.setdefault(col, np.full(len(df), np.nan))[rows] = values
+
+    for col, values in columns.items():
+        summary[col] = values
+    return summary
@@ -0,0 +1,197 @@
+# wsi/serve.py
+"""
+Local JSON query service over a processed WSI panel.
+
+    python -m wsi.serve --port 8000
+    GET /query?ISO_code=KHM&Year=2010-2024
+    GET /query?Subregion=Southern%20Asia&Year=2024&columns=Economy,WSI%20(Baseline)
+
+Filters on the indexed columns accept comma-separated values (and year
+ranges); responses carry an ETag and are cached per panel version.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from wsi.utils import processed_data_path
+
+INDEXED_COLUMNS = ["ISO_code", "Year", "Subregion", "Region", "Income"]
+CACHE_SIZE = 1024
+# seconds between checks of the output file for a newer version
+RELOAD_INTERVAL = 1.0
+
+
+class PanelIndex:
+    """An immutable, indexed snapshot of one version of the panel file."""
+
+    def __init__(self, path):
+        stat = os.stat(path)
+        self.version = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+        self.mtime_ns = stat.st_mtime_ns
+        self.df = pd.read_csv(path)
+        self.index = {}
+        for col in INDEXED_COLUMNS:
+            if col in self.df.columns:
+                codes, uniques = pd.factorize(self.df[col])
+                order = np.argsort(codes, kind="stable")
+                bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+                self.index[col] = {
+                    str(value): order[bounds[i] : bounds[i + 1]]
+                    for i, value in enumerate(uniques)
+                }
+
+    def _lookup(self, col: str, spec: str) -> np.ndarray:
+        values = []
+        for part in spec.split(","):
+            part = part.strip()
+            if col == "Year" and "-" in part:
+                start, stop = (int(y) for y in part.split("-", 1))
+                values.extend(str(y) for y in range(start, stop + 1))
+            else:
+                values.append(part)
+        hits = [self.index[col][v] for v in values if v in self.index[col]]
+        return np.concatenate(hits) if hits else np.empty(0, dtype=np.intp)
+
+    def query(self, filters: dict[str, str], columns: list[str] | None) -> bytes:
+        """JSON records of the rows matching every filter, in file order."""
+        rows = None
+        for col, spec in filters.items():
+            if col not in self.index:
+                raise KeyError(f"not an indexed column: {col}")
+            hits = self._lookup(col, spec)
+            rows = hits if rows is None else np.intersect1d(rows, hits)
+        rows = np.arange(len(self.df)) if rows is None else np.sort(rows)
+
+        result = self.df.iloc[rows]
+        if columns:
+            missing = [c for c in columns if c not in self.df.columns]
+            if missing:
+                raise KeyError(f"unknown columns: {missing}")
+            result = result[columns]
+        return result.to_json(orient="records").encode()
+
+
+class PanelService:
+    """Holds the current PanelIndex, swaps in new versions and caches responses."""
+
+    def __init__(self, path):
+        self.path = path
+        self.panel = PanelIndex(path)
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.last_check = 0.0
+
+    def current(self) -> PanelIndex:
+        """The latest panel, reloading (outside the lock) if the file changed."""
+        now = time.monotonic()
+        if now - self.last_check >= RELOAD_INTERVAL:
+            self.last_check = now
+            try:
+                mtime_ns = os.stat(self.path).st_mtime_ns
+            except FileNotFoundError:
+                mtime_ns = self.panel.mtime_ns  # mid-rewrite; keep the old version
+            # only pick up a new version once the writer has gone quiet
+            settled = time.time() - mtime_ns / 1e9 >= RELOAD_INTERVAL
+            changed = mtime_ns != self.panel.mtime_ns and settled
+            if changed:
+                try:
+                    panel = PanelIndex(self.path)
+                except (OSError, pd.errors.ParserError, pd.errors.EmptyDataError):
+                    panel = None  # partially written; retry on a later request
+                if panel is not None:
+                    with self.lock:
+                        self.panel = panel
+                        self.cache.clear()
+        return self.panel
+
+    def respond(self, query: str) -> tuple[str, bytes]:
+        """(etag, body) for a query string, served from the LRU cache if possible."""
+        params = parse_qs(query)
+        columns = params.pop("columns", [None])[0]
+        columns = columns.split(",") if columns else None
+        filters = {col: ",".join(values) for col, values in sorted(params.items())}
+
+        panel = self.current()
+        key = (panel.version, json.dumps([filters, columns]))
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+
+        body = panel.query(filters, columns)
+        etag = '"' + hashlib.blake2b(key[1].encode(), digest_size=8).hexdigest()
+        etag += f'-{panel.version}"'
+        with self.lock:
+            self.cache[key] = (etag, body)
+            if len(self.cache) > CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return etag, body
+
+
+def make_handler(service: PanelService):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/health":
+                self._send(200, json.dumps({"version": service.current().version}))
+                return
+            if url.path != "/query":
+                self._send(404, json.dumps({"error": "not found"}))
+                return
+            try:
+                etag, body = service.respond(url.query)
+            except (KeyError, ValueError) as e:
+                self._send(400, json.dumps({"error": str(e.args[0])}))
+                return
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self._send(200, body, etag)
+
+        def _send(self, status: int, body, etag: str | None = None):
+            body = body.encode() if isinstance(body, str) else body
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a processed WSI panel.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--file",
+        default=str(processed_data_path("womens_safety_index_baseline.csv")),
+        help="processed CSV to serve",
+    )
+    args = parser.parse_args()
+
+    service = PanelService(args.file)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Serving {args.file} on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
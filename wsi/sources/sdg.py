@@ -0,0 +1,87 @@
+# wsi/sources/sdg.py
+"""
+Shared reader for UN SDG Global Database extracts (Goal<N>.xlsx), filtering
+rows and projecting columns while the workbook is streamed.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from wsi.mapping.country_iso import resolve_iso
+from wsi.utils import cached_parse, raw_data_path
+
+# bump whenever read_sdg's output changes, to invalidate cached reads
+READER_VERSION = 1
+
+
+def read_sdg(
+    path: Path,
+    sheet: str | None = None,
+    filters: dict[str, str] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Rows of `sheet` (default the first) whose cells equal every `filters`
+    value, keeping only `columns`. The workbook is iterated read-only, so
+    rows that fail the filters are never materialised.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = workbook[sheet] if sheet is not None else workbook.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = list(next(rows))
+        columns = header if columns is None else columns
+        position = {name: i for i, name in enumerate(header)}
+        # without a dimension record read-only rows stop at their last cell
+        width = len(header)
+        rows = ((*row, *[None] * (width - len(row))) for row in rows)
+
+        tests = [(position[col], value) for col, value in (filters or {}).items()]
+        keep = [position[col] for col in columns]
+        data = [
+            [row[i] for i in keep]
+            for row in rows
+            if all(row[i] == value for i, value in tests)
+        ]
+    finally:
+        workbook.close()
+
+    df = pd.DataFrame(data, columns=columns)
+    # empty cells as NaN, as pd.read_excel gives them
+    text = df.columns[df.dtypes == object]
+    df[text] = df[text].where(df[text].notna(), np.nan)
+    return df
+
+
+def load_sdg(
+    folder: str,
+    file: str,
+    columns: list[str],
+    filters: dict[str, str] | None = None,
+    sheet: str | None = None,
+    iso_codes: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    `columns` of the SDG extract rows matching `filters`, with GeoAreaName
+    resolved to ISO_code once per distinct name (aggregates are dropped).
+    The filtered read is cached on the file content and arguments.
+    """
+    df = cached_parse(
+        read_sdg,
+        "sdg",
+        raw_data_path(folder, file),
+        version=READER_VERSION,
+        sheet=sheet,
+        filters=filters,
+        columns=["GeoAreaName", *columns],
+    )
+
+    df["ISO_code"] = resolve_iso(df["GeoAreaName"], errors="ignore")
+    df = df.dropna(subset=["ISO_code"])
+
+    if iso_codes is not None:
+        df = df[df["ISO_code"].isin(iso_codes)]
+
+    return df[["ISO_code", *columns]].reset_index(drop=True)
@@ -0,0 +1,100 @@
+# wsi/sources/wdi.py
+"""
+Shared reader for World Bank WDI extracts: Databank downloads (with a metadata
+footer), API downloads (with a metadata header) and the bulk WDI CSV.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+from wsi.utils import clean_year_columns, raw_data_path, read_raw_csv
+
+# Databank downloads call it "Series Code", API and bulk files "Indicator Code"
+CODE_COLUMNS = ["Series Code", "Indicator Code"]
+
+
+def header_line(path: Path, max_lines: int = 50) -> int:
+    """Line of the column header (API downloads put metadata lines first)."""
+    with open(path, encoding="utf-8-sig") as f:
+        for i, line in enumerate(f):
+            if line.lstrip('"').startswith("Country Name"):
+                return i
+            if i >= max_lines:
+                break
+    return 0
+
+
+def is_year_column(col: str) -> bool:
+    # "2020" or Databank's "2020 [YR2020]"
+    first = col.split()[0] if col.split() else ""
+    return len(first) == 4 and first.isdigit()
+
+
+def read_wdi(path: Path) -> pd.DataFrame:
+    """
+    A WDI table with the metadata header and footer dropped, year columns
+    read as float64 ('..' is missing) and named by their integer year.
+    """
+    skiprows = header_line(path)
+    header = pd.read_csv(path, skiprows=skiprows, nrows=0).columns
+    dtype = {col: "float64" for col in header if is_year_column(col)}
+    df = read_raw_csv(path, skiprows=skiprows, dtype=dtype, na_values=[".."])
+
+    # the footer ("Data from database: ...", "Last Updated: ...") starts at
+    # the first row without a series code
+    code_col = next(col for col in CODE_COLUMNS if col in df.columns)
+    footer = df[code_col].isna().to_numpy()
+    if footer.any():
+        df = df.iloc[: footer.argmax()]
+
+    df = df.rename(columns={code_col: "Series Code"})
+    clean_year_columns(df)
+    return df.rename(columns={col: int(col) for col in df.columns if col.isdigit()})
+
+
+_read_wdi = lru_cache(maxsize=None)(read_wdi)
+
+
+def load_wdi_raw(folder: str, file: str) -> pd.DataFrame:
+    """
+    read_wdi of data/raw/<folder>/<file>, kept for the rest of the run under
+    its resolved path so several indicators can pull series from one dump.
+    """
+    return _read_wdi(raw_data_path(folder, file).resolve())
+
+
+def load_wdi(
+    folder: str,
+    file: str,
+    series: dict[str, str],
+    iso_codes: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    ISO_code/Year panel with one column per WDI `series` (mapping of series
+    code to output name), all extracted from one parse of the file. Rows
+    with no value for any of the series are dropped.
+    """
+    df = load_wdi_raw(folder, file)
+    df = df[df["Series Code"].isin(series)]
+    if iso_codes is not None:
+        df = df[df["Country Code"].isin(iso_codes)]
+
+    years = [col for col in df.columns if isinstance(col, int)]
+    df_long = df.melt(
+        id_vars=["Country Code", "Series Code"],
+        value_vars=years,
+        var_name="Year",
+        value_name="Value",
+    ).dropna(subset=["Value"])
+
+    # pivot raises if a country has the same series twice
+    panel = df_long.pivot(
+        index=["Country Code", "Year"], columns="Series Code", values="Value"
+    )
+    panel = panel.reindex(columns=list(series)).rename(columns=series)
+    panel.columns.name = None
+    panel = panel.reset_index().rename(columns={"Country Code": "ISO_code"})
+    panel["Year"] = panel["Year"].astype(int)
+
+    return panel[["ISO_code", "Year", *series.values()]]
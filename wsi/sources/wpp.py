@@ -0,0 +1,61 @@
+# wsi/sources/wpp.py
+"""Shared access to the UN World Population Prospects 2024 compact workbook."""
+
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+from wsi.utils import raw_data_path, read_raw_excel
+
+CONFIG = {
+    "file": "WPP2024_GEN_F01_DEMOGRAPHIC_INDICATORS_COMPACT.xlsx",
+    "estimates_sheet": "Estimates",
+    "projection_sheet": "Medium variant",
+    "skiprows": 16,
+    # medium-variant years appended to the historical estimates
+    "projection_years": [2024, 2025],
+}
+
+
+@lru_cache(maxsize=None)
+def _read_wpp(path: Path) -> pd.DataFrame:
+    """Historical estimates plus the medium-variant projection years."""
+    sheets = read_raw_excel(
+        path,
+        sheet_name=[CONFIG["estimates_sheet"], CONFIG["projection_sheet"]],
+        skiprows=CONFIG["skiprows"],
+    )
+    hist = sheets[CONFIG["estimates_sheet"]]
+    proj = sheets[CONFIG["projection_sheet"]]
+    proj = proj[proj["Year"].isin(CONFIG["projection_years"])]
+    return pd.concat([hist, proj], ignore_index=True)
+
+
+def load_wpp_raw(folder: str) -> pd.DataFrame:
+    """
+    The WPP table of data/raw/<folder>, memoised on the workbook's resolved
+    path: folders that link to one workbook share it in memory, while
+    separate copies (as in indicators/ and shocks/) are each read once.
+    """
+    return _read_wpp(raw_data_path(folder, CONFIG["file"]).resolve())
+
+
+def load_wpp(
+    folder: str, columns: dict[str, str], iso_codes: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    ISO_code/Year panel of the WPP `columns` (mapping of WPP column name to
+    output name), dropping rows with any missing value.
+    """
+    cols = ["ISO3 Alpha-code", "Year", *columns]
+    df = load_wpp_raw(folder)[cols].dropna(subset=cols)
+
+    df = df.rename(columns={"ISO3 Alpha-code": "ISO_code", **columns})
+    df["Year"] = df["Year"].astype(int)
+    for col in columns.values():
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    if iso_codes is not None:
+        df = df[df["ISO_code"].isin(iso_codes)]
+
+    return df.reset_index(drop=True)
@@ -0,0 +1,132 @@
+# wsi/uncertainty.py
+"""Monte Carlo uncertainty of the baseline WSI from its imputed values."""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from wsi.config import AGGREGATION, IMPUTATION_NOISE, INDICATORS, SOURCE_TAGS
+from wsi.scoring import score_values
+from wsi.sensitivity import INDICATOR_ORDER, dimension_membership
+
+# arrays of the current run, mapped into every worker by `_attach`
+_SHARED = {}
+
+
+def perturbation_scale(df: pd.DataFrame) -> np.ndarray:
+    """
+    (rows x indicators) noise standard deviations: the IMPUTATION_NOISE
+    fraction for each cell's (uint8-coded) source tag times the indicator's
+    standard deviation across the panel (zero for an indicator with no
+    observations, which then keeps its missing pattern in every draw).
+    """
+    values = df[INDICATOR_ORDER].to_numpy(dtype=float)
+    observed = ~np.isnan(values).all(axis=0)
+    spread = np.zeros(values.shape[1])
+    spread[observed] = np.nanstd(values[:, observed], axis=0)
+    codes = df[[f"{ind} (source)" for ind in INDICATOR_ORDER]].to_numpy(np.uint8)
+    noise = np.array([IMPUTATION_NOISE.get(tag, 0.0) for tag in SOURCE_TAGS])
+    return noise[codes] * spread
+
+
+def _attach(specs: dict[str, tuple[str, tuple[int, ...]]]) -> None:
+    """Pool initializer: map the parent's shared arrays without copying."""
+    for key, (name, shape) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        _SHARED[key] = (shm, np.ndarray(shape, dtype=float, buffer=shm.buf))
+
+
+def _run_draws(start: int, stop: int, seed, method: str | float) -> None:
+    """Score draws [start, stop) into the shared output array."""
+    values = _SHARED["values"][1]
+    scale = _SHARED["scale"][1]
+    out = _SHARED["out"][1]
+    low = np.nanmin(values, axis=0)
+    high = np.nanmax(values, axis=0)
+    invert = [INDICATORS[ind]["invert"] for ind in INDICATOR_ORDER]
+    membership = dimension_membership()
+
+    rng = np.random.default_rng(seed)
+    for draw in range(start, stop):
+        noisy = values + scale * rng.standard_normal(values.shape)
+        # stay within the observed range so normalisation bounds are stable
+        noisy = np.clip(noisy, low, high)
+        out[draw] = score_values(noisy, invert, membership, method)
+
+
+def simulate_wsi(
+    df: pd.DataFrame,
+    draws: int,
+    max_workers: int | None = None,
+    seed: int = 0,
+    batch_size: int = 50,
+    method: str | float = AGGREGATION,
+) -> np.ndarray:
+    """
+    (draws x rows) WSI scores of the filled panel `df` with every imputed
+    cell perturbed by Gaussian noise scaled per `perturbation_scale`.
+
+    The panel lives in shared memory mapped by each worker; batches of
+    `batch_size` draws get independent child seeds of `seed`, so results do
+    not depend on the number of workers.
+    """
+    arrays = {
+        "values": df[INDICATOR_ORDER].to_numpy(dtype=float),
+        "scale": perturbation_scale(df),
+        "out": np.empty((draws, len(df))),
+    }
+    starts = list(range(0, draws, batch_size))
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    tasks = [
+        (start, min(start + batch_size, draws), s) for start, s in zip(starts, seeds)
+    ]
+
+    if max_workers == 1:
+        _SHARED.update({key: (None, arr) for key, arr in arrays.items()})
+        try:
+            for start, stop, s in tasks:
+                _run_draws(start, stop, s, method)
+            return arrays["out"]
+        finally:
+            _SHARED.clear()
+
+    blocks = {}
+    try:
+        specs = {}
+        for key, arr in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            blocks[key] = shm
+            np.ndarray(arr.shape, dtype=float, buffer=shm.buf)[...] = arr
+            specs[key] = (shm.name, arr.shape)
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_attach, initargs=(specs,)
+        ) as pool:
+            futures = [pool.submit(_run_draws, *task, method) for task in tasks]
+            for future in futures:
+                future.result()
+
+        shm = blocks["out"]
+        return np.ndarray(arrays["out"].shape, dtype=float, buffer=shm.buf).copy()
+    finally:
+        for shm in blocks.values():
+            shm.close()
+            shm.unlink()
+
+
+def imputation_uncertainty(
+    df: pd.DataFrame,
+    draws: int,
+    max_workers: int | None = None,
+    seed: int = 0,
+    percentiles: tuple[float, ...] = (5, 50, 95),
+) -> pd.DataFrame:
+    """Percentile bands of the WSI per country-year across Monte Carlo draws."""
+    simulated = simulate_wsi(df, draws, max_workers, seed)
+    bands = df[["ISO_code", "Year"]].reset_index(drop=True)
+    with np.errstate(invalid="ignore"):
+        for q in percentiles:
+            bands[f"WSI p{q:g}"] = np.nanpercentile(simulated, q, axis=0)
+    return bands
@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import os
+import pickle
 from pathlib import Path
 import pandas as pd
 
@@ -22,6 +25,10 @@ def processed_data_path(*segments) -> Path:
     return project_root() / "data" / "processed" / Path(*segments)
 
 
+def cache_data_path(*segments) -> Path:
+    return project_root() / "data" / "cache" / Path(*segments)
+
+
 def ignore_get_iso(name: str):
     """ignore continents, world bank puts regions into this column too"""
     try:
@@ -33,3 +40,117 @@ def ignore_get_iso(name: str):
 def clean_year_columns(df: pd.DataFrame) -> None:
     """Strip year info (e.g., 'YR2020') from column names."""
     df.columns = [col.split()[0] if "YR" in col else col for col in df.columns]
+
+
+def file_digest(path: Path) -> str:
+    """Content hash of a file, read in 1 MiB blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_key(
+    reader: str,
+    path: Path,
+    kwargs: dict,
+    digest: str | None = None,
+    version: int | None = None,
+) -> tuple[str, str]:
+    """
+    (slot, key) of a parsed table. The slot is the file path, the reader
+    and its arguments; the key adds the reader version and file content, so
+    a refreshed raw file or changed reader gets a new key in the same slot.
+    """
+    slot = hashlib.blake2b(digest_size=8)
+    slot.update(str(path.resolve()).encode())
+    slot.update(reader.encode())
+    slot.update(repr(sorted(kwargs.items())).encode())
+
+    key = hashlib.blake2b(digest_size=16)
+    key.update(slot.digest())
+    key.update(repr(version).encode())
+    key.update((digest or file_digest(path)).encode())
+    return slot.hexdigest(), key.hexdigest()
+
+
+def write_atomic(path: Path, write) -> None:
+    """Write via a temporary file so concurrent readers never see partial output."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _pickle_to(obj):
+    def write(path: Path) -> None:
+        with open(path, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    return write
+
+
+def cached_parse(
+    parse,
+    name: str,
+    path: Path,
+    digest: str | None = None,
+    version: int | None = None,
+    **kwargs,
+):
+    """
+    `parse(path, **kwargs)`, memoised under data/cache/.
+
+    Entries are keyed on the file's path and content hash, the parser `name`
+    and `version` (bump it when the parser's logic changes) and its
+    arguments, so a changed raw file is transparently re-parsed and the
+    entry it replaces is deleted. Tables are stored as Parquet; anything
+    Parquet cannot hold (mixed-type object columns, the dict returned by
+    `sheet_name=None`) falls back to a pickle. Pass the file's `digest` when
+    it is already known to skip re-hashing.
+    """
+    path = Path(path)
+    slot, key = _cache_key(name, path, kwargs, digest, version)
+    parquet_path = cache_data_path(f"{slot}-{key}.parquet")
+    pickle_path = cache_data_path(f"{slot}-{key}.pkl")
+
+    if parquet_path.exists():
+        return pd.read_parquet(parquet_path)
+    if pickle_path.exists():
+        with open(pickle_path, "rb") as f:
+            return pickle.load(f)
+
+    result = parse(path, **kwargs)
+
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        write_atomic(parquet_path, result.to_parquet)
+    except Exception:
+        # not representable in Parquet (or not a DataFrame at all)
+        write_atomic(pickle_path, _pickle_to(result))
+
+    # drop entries of earlier file contents or reader versions
+    for ext in ("parquet", "pkl"):
+        for stale in parquet_path.parent.glob(f"{slot}-*.{ext}"):
+            if not stale.name.startswith(f"{slot}-{key}."):
+                stale.unlink(missing_ok=True)
+
+    return result
+
+
+def cached_read(reader: str, path: Path, digest: str | None = None, **kwargs):
+    """`pd.read_<reader>(path, **kwargs)`, memoised by cached_parse."""
+    return cached_parse(getattr(pd, f"read_{reader}"), reader, path, digest, **kwargs)
+
+
+def read_raw_csv(path: Path, **kwargs) -> pd.DataFrame:
+    """`pd.read_csv` backed by the on-disk raw table cache."""
+    return cached_read("csv", path, **kwargs)
+
+
+def read_raw_excel(path: Path, digest: str | None = None, **kwargs):
+    """`pd.read_excel` backed by the on-disk raw table cache."""
+    return cached_read("excel", path, digest, **kwargs)
@@ -0,0 +1,71 @@
+# wsi/weighting.py
+"""
+Population-weighted aggregation of age-disaggregated rates (e.g. ILO series
+by age band) to one value per country and year.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def band_population(
+    population: pd.DataFrame, bands: dict[str, list[str]]
+) -> pd.DataFrame:
+    """
+    ISO_code/Year panel with one column per band: the sum of that band's
+    population series columns (NaN where all of them are missing).
+    """
+    out = population[["ISO_code", "Year"]].copy()
+    for band, series in bands.items():
+        out[band] = population[series].sum(axis=1, min_count=1)
+    return out
+
+
+def weighted_band_rate(
+    rates: pd.DataFrame,
+    population: pd.DataFrame,
+    value: str,
+    band: str = "Age Group",
+) -> pd.DataFrame:
+    """
+    Population-weighted mean of `value` over the bands of each (ISO_code,
+    Year) in `rates`, weighting by `population` (as from band_population).
+
+    ISO, year and band are encoded as integer codes, so each rate row finds
+    its population by indexing a dense country x year x band array and all
+    country-years are reduced in one bincount. Rows whose band, country or
+    year has no population, or whose rate is missing, are left out.
+    """
+    bands = population.columns.drop(["ISO_code", "Year"])
+    pop_iso, isos = pd.factorize(population["ISO_code"], sort=True)
+    pop_year = population["Year"].to_numpy(dtype=int)
+    first_year = pop_year.min()
+    n_years = pop_year.max() - first_year + 1
+
+    cube = np.full((len(isos), n_years, len(bands)), np.nan)
+    cube[pop_iso, pop_year - first_year] = population[bands].to_numpy(dtype=float)
+
+    iso = isos.get_indexer(rates["ISO_code"])
+    year = rates["Year"].to_numpy(dtype=int) - first_year
+    band_code = bands.get_indexer(rates[band])
+    found = (iso >= 0) & (band_code >= 0) & (year >= 0) & (year < n_years)
+
+    weight = np.full(len(rates), np.nan)
+    weight[found] = cube[iso[found], year[found], band_code[found]]
+    weighted = weight * rates[value].to_numpy(dtype=float)
+    valid = ~np.isnan(weighted)
+
+    keys, group = np.unique(iso[valid] * n_years + year[valid], return_inverse=True)
+    weight_sum = np.bincount(group, weights=weight[valid], minlength=len(keys))
+    weighted_sum = np.bincount(group, weights=weighted[valid], minlength=len(keys))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = weighted_sum / weight_sum
+
+    return pd.DataFrame(
+        {
+            "ISO_code": isos[keys // n_years],
+            "Year": keys % n_years + first_year,
+            value: rate,
+        }
+    )